@@ -224,7 +224,7 @@ def skewness(x):
   diff = x - x.mean()
   n = len(x) - 1
   sigma = x.std()
-  output = sum(diff**3) / (n * sigma**3)
+  output = (diff**3).sum() / (n * sigma**3)
   return output
 
 
@@ -234,6 +234,10 @@ skewness(x = sw)
 # Get skewness from a pandas series
 sw.skew() # their formula differs slightly.
 
+# Tip: for really big data (or data that comes in chunks),
+# the Moments() tracker in O/distributions.py computes the same skewness
+# and kurtosis in a single pass, one chunk at a time.
+
 
 ## Kurtosis  ########################
 
@@ -269,7 +273,7 @@ def kurtosis(x):
   diff = x - x.mean()
   n = len(x) - 1
   sigma = x.std()
-  output = sum(diff**4) / (n * sigma**4)
+  output = (diff**4).sum() / (n * sigma**4)
   return output
 
 # Try it!
@@ -12,6 +12,18 @@
 import pandas as pd # data wrangling
 from plotnine import * # data visualization
 import scipy # probability functions
+import os
+import sys
+
+# We'll also use a few helper functions written up in the script bootstrap.py
+# Append files in this folder (functions) to the Python Path
+sys.path.append(os.path.abspath('E'))
+# Now you can reference them directly
+from bootstrap import *
+
+# Save our simulations to disk, so re-running this script (with the same seeds)
+# loads them back instead of recomputing them
+cache = ResultCache("E/.cache")
 
 # Load data
 counties = pd.read_csv("E/environmental_health.csv").dropna()
@@ -82,16 +94,14 @@ s
 # That distribution is called a sampling distribution.
 
 # It shows how much a statistic varies due to random sampling / chance.
-d = pd.DataFrame({ 
-    'rep': range(1,1000+1)  
-    # For each rep, apply this function...
-  }).groupby('rep').apply(
-    # Where df is that rep...
-    lambda df: pd.Series({
-  'mu': pop.sample(n = 100).air_pollution.mean()
-  })
-  # Then return 'rep' to be a column
-).reset_index()
+
+# For 1000 reps, we could take pop.sample(n = 100) and its mean, one rep at a time...
+# but subsample() (from bootstrap.py) draws all 1000 samples of 100 counties 
+# straight from the air_pollution values at once, then calculates each mean.
+d = pd.DataFrame({
+  'rep': range(1,1000+1),
+  'mu': cache(subsample, pop.air_pollution, n = 100, stat = "mean", R = 1000, rng = 12345)
+})
 
 # Let's view 'd', our sampling distribution data.frame
 d
@@ -161,6 +171,10 @@ pd.DataFrame({
 # Let's compare that to the standard deviation of the sampling distribution!
 d.mu.std()
 
+# Since we have the full population here, we can also calculate the exact standard error,
+# for samples of 100 drawn without replacement from these counties.
+finite_population_se(pop.air_pollution, n = 100)
+
 
 
 # HOLY CRAP! It works!
@@ -228,26 +242,33 @@ d.mu.quantile(q = [0.025, 0.975])
 # creating slightly different samples many many times in a row
 
 # 1000 times in a row...
-b = pd.DataFrame({ 
-    'rep': range(1,1000+1)  
-    # For each rep, apply this function...
-  }).groupby('rep').apply(
-    # Where df is that rep...
-    lambda df: pd.Series({
-      # Sample with replacement, then calculate the mean
-      'mu': pop.sample(n = 100, replace = True).air_pollution.mean()
-  })
-  # Then return 'rep' to be a column
-).reset_index()
+# bootstrap() (from bootstrap.py) samples 100 values with replacement, 
+# then calculates the mean, for each of 1000 reps.
+# It draws all the reps at once, so even 100,000 reps take a blink.
+# (Wrapping it in cache() saves the reps, since we fixed the seed with rng.)
+b = pd.DataFrame({
+  'rep': range(1,1000+1),
+  'mu': cache(bootstrap, pop.air_pollution, stat = "mean", R = 1000, n = 100, rng = 12345)
+})
 
 b
 
+# Tip: if your data is too big to load all at once, poisson_bootstrap() 
+# bootstraps it in one pass, a chunk at a time, e.g.:
+# poisson_bootstrap(pd.read_csv("E/environmental_health.csv", chunksize = 500), 'air_pollution', R = 1000)
+
 # View the distribution!
 ( ggplot() + geom_histogram(data = b, mapping = aes(x = 'mu')) )
 
 # This is an approximated sampling distribution,
 # also known as a bootstrapped sampling distribution.
 
+# From a single sample, interval() bootstraps a 95% confidence interval directly.
+# Its default "bca" method corrects the percentiles for bias and skew;
+# method = "t" standardizes each replicate by its own bootstrapped standard error.
+interval(sample.air_pollution, stat = "mean", method = "bca")
+interval(sample.air_pollution, stat = "median", method = "t")
+
 
 
 # 8. Comparisons ######################################################
@@ -0,0 +1,861 @@
+# bootstrap.py
+# Installation requirements
+# !pip install numpy pandas
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from inspect import signature
+from multiprocessing import shared_memory
+import hashlib
+import marshal
+import os
+import sys
+import types
+import numpy as np
+import pandas as pd
+from scipy import special
+
+# What `from bootstrap import *` brings in: the functions below, but not the modules they use
+__all__ = [
+    'bootstrap', 'quantile', 'subsample', 'finite_population_se',
+    'jackknife', 'interval', 'PoissonBootstrap', 'poisson_bootstrap', 'ResultCache',
+]
+
+# Reducers #########################################
+
+# A reducer turns a block of resamples (one row per replicate) into one statistic per row.
+# Built-in reducers are named by string; any function that reduces along axis=1 works too.
+_REDUCERS = {
+    'mean': lambda samples: samples.mean(axis=1),
+    'median': lambda samples: np.median(samples, axis=1),
+    'sd': lambda samples: samples.std(axis=1, ddof=1),
+    'var': lambda samples: samples.var(axis=1, ddof=1),
+    'sum': lambda samples: samples.sum(axis=1),
+    'min': lambda samples: samples.min(axis=1),
+    'max': lambda samples: samples.max(axis=1),
+    # For 2-column data (x, y): the sum of x over the sum of y
+    'ratio': lambda samples: samples[..., 0].sum(axis=1) / samples[..., 1].sum(axis=1),
+}
+
+def quantile(q):
+    """
+    Make a reducer that takes the q-th quantile(s) of each replicate, for `bootstrap`.
+
+    Parameters:
+    -----------
+    q : float or sequence of float
+        The quantile(s) to take, between 0 and 1.
+
+    Returns:
+    --------
+    function
+        A reducer, giving one value per replicate (or one column per quantile, if q is a sequence).
+
+    Examples:
+    ---------
+    bootstrap(x, stat=quantile([0.25, 0.75]))
+    """
+    return _Quantile(q)
+
+class _Quantile:
+    # A class rather than a closure, so it can be pickled to worker processes
+    def __init__(self, q):
+        self.q = np.asarray(q, dtype=float)
+
+    def __call__(self, samples):
+        return np.moveaxis(np.quantile(samples, self.q, axis=1), 0, -1)
+
+def _reducer(stat):
+    if callable(stat):
+        return stat
+    if isinstance(stat, str) and stat in _REDUCERS:
+        return _REDUCERS[stat]
+    raise ValueError("`stat` must be a function or one of " + ", ".join(_REDUCERS) + ".")
+
+# Bootstrapping ####################################
+
+def _sample(x):
+    """
+    The sample as a float array: 1-D for a single column, or one row per record for several.
+    """
+    x = np.asarray(x, dtype=float)
+    return x if x.ndim == 2 else np.ravel(x)
+
+def _width(x):
+    return 1 if x.ndim == 1 else x.shape[1]
+
+# Replicates per random stream. This is fixed (not tied to the number of workers or to memory),
+# which is what makes bootstraps identical for a given seed, however they're split up.
+BLOCK = 2**12
+
+def _resample(x, n, count, rows, reducer, rng, output):
+    """
+    Compute the statistic for `count` resamples of size n from x, `rows` resamples at a time,
+    all drawn from `rng`, and write them into `output`.
+    """
+    for start in range(0, count, rows):
+        stop = min(start + rows, count)
+        index = rng.integers(0, len(x), size=(stop - start, n))
+        output[start:stop] = reducer(x[index])
+
+def _fill(x_name, x_shape, out_name, out_shape, out_dtype, start, stop, n, rows, stat, rng):
+    """
+    Worker task for parallel bootstraps: compute replicates start to stop from the sample
+    in shared memory block `x_name`, and write them into shared memory block `out_name`.
+    """
+    source = shared_memory.SharedMemory(name=x_name)
+    target = shared_memory.SharedMemory(name=out_name)
+    try:
+        x = np.ndarray(x_shape, dtype=np.float64, buffer=source.buf)
+        x.flags.writeable = False
+        output = np.ndarray(out_shape, dtype=out_dtype, buffer=target.buf)
+        _resample(x, n, stop - start, rows, _reducer(stat), rng, output[start:stop])
+        del x, output
+    finally:
+        source.close()
+        target.close()
+
+def bootstrap(x, stat='mean', R=1000, n=None, rng=None, chunk_cells=2**22, workers=None):
+    """
+    Bootstrap a statistic: resample x with replacement R times, and compute the statistic for each resample.
+
+    The resamples are drawn as a matrix of row indices with numpy, R replicates by n values,
+    and the statistic is computed for many replicates at once, holding at most `chunk_cells`
+    values at a time, so memory stays bounded for any R. Every BLOCK replicates get their own
+    random stream, spawned from `rng`, so the results depend only on `rng`: not on `chunk_cells`,
+    and not on `workers`.
+
+    Parameters:
+    -----------
+    x : array-like
+        The sample to resample (e.g. a pandas Series).
+        A 2-D array or DataFrame is resampled by whole rows (e.g. columns x and y, for stat="ratio").
+    stat : str or function, optional, default='mean'
+        The statistic: "mean", "median", "sd", "var", "sum", "min", or "max";
+        "ratio" (for 2-column data: the sum of the first column over the sum of the second);
+        a reducer from `quantile()`; or any function that takes a 2-D array with one resample per row
+        and returns one value per row (e.g. lambda s: s.mean(axis=1)).
+        With `workers`, a function must be picklable (defined with def at the top level of a module).
+    R : int, optional, default=1000
+        The number of replicates.
+    n : int, optional, default=None
+        The size of each resample. Defaults to the size of x.
+    rng : numpy.random.Generator or int, optional, default=None
+        The random number generator (or a seed for one). Defaults to fresh entropy.
+    chunk_cells : int, optional, default=2**22
+        The most resampled values to hold in memory at once (per worker).
+    workers : int, optional, default=None
+        The number of processes to split the blocks of replicates across. Leave as None to run them all here.
+        The results are the same for any number of workers, given the same `rng`.
+
+    Returns:
+    --------
+    numpy.ndarray
+        The statistic for each replicate: R values (or R rows, for statistics with several values).
+
+    Examples:
+    ---------
+    # The bootstrapped sampling distribution of the mean
+    b = pd.DataFrame({'rep': range(1, 1000 + 1), 'mu': bootstrap(sample.air_pollution, R=1000)})
+    # ...of the 25th and 75th percentiles
+    bootstrap(sample.air_pollution, stat=quantile([0.25, 0.75]))
+    # A million replicates, on 32 processes
+    bootstrap(sample.air_pollution, R=10**6, rng=12345, workers=32)
+    """
+    x = _sample(x)
+    n = len(x) if n is None else n
+    if len(x) == 0 or n < 1:
+        raise ValueError("Need a non-empty sample and a resample size of at least 1.")
+    reducer = _reducer(stat)
+    rng = np.random.default_rng(rng)
+    if workers is not None and workers < 1:
+        raise ValueError("`workers` must be at least 1.")
+    rows = max(1, min(BLOCK, chunk_cells // (n * _width(x))))
+    starts = range(0, R, BLOCK)
+    streams = rng.spawn(len(starts))
+    # The shape and type of one replicate's statistic
+    probe = np.asarray(reducer(x[np.zeros((1, n), dtype=np.intp)]))
+    shape, dtype = (R,) + probe.shape[1:], probe.dtype
+    if workers is None or workers == 1:
+        output = np.empty(shape, dtype=dtype)
+        for start, stream in zip(starts, streams):
+            stop = min(start + BLOCK, R)
+            _resample(x, n, stop - start, rows, reducer, stream, output[start:stop])
+        return output
+    # Share the sample with the workers, and have them write their replicates
+    # straight into a shared output array, each block at its own fixed offset
+    source = shared_memory.SharedMemory(create=True, size=x.nbytes)
+    target = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+    try:
+        np.ndarray(x.shape, dtype=np.float64, buffer=source.buf)[:] = x
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tasks = [pool.submit(_fill, source.name, x.shape, target.name, shape, dtype,
+                                 start, min(start + BLOCK, R), n, rows, stat, stream)
+                     for start, stream in zip(starts, streams)]
+            for task in tasks:
+                task.result()
+        output = np.ndarray(shape, dtype=dtype, buffer=target.buf).copy()
+    finally:
+        source.close()
+        source.unlink()
+        target.close()
+        target.unlink()
+    return output
+
+# Subsampling ######################################
+
+def _draw(N, n, rows, rng):
+    """
+    Draw `rows` random subsets of n of the indices 0 to N-1, without replacement, as a (rows, n) array.
+
+    Runs a partial Fisher-Yates shuffle on every row at once: each step swaps one random
+    not-yet-drawn index into place. Only min(n, N - n) steps are needed, since leaving
+    N - n indices out is the same as drawing the other n.
+    """
+    index = np.tile(np.arange(N), (rows, 1))
+    steps = min(n, N - n)
+    row = np.arange(rows)
+    for i in range(steps):
+        j = rng.integers(i, N, size=rows)
+        index[row, i], index[row, j] = index[row, j], index[row, i]
+    return index[:, :n] if steps == n else index[:, steps:]
+
+def subsample(x, n, stat='mean', R=1000, rng=None, chunk_cells=2**22):
+    """
+    Simulate a sampling distribution: draw R samples of size n from x without replacement,
+    and compute the statistic for each sample.
+
+    Works on the bare values, like `bootstrap`: the samples are drawn as blocks of row indices,
+    and the statistic is computed for a whole block at once, with no DataFrames in between.
+    Blocks hold at most `chunk_cells` indices, so memory stays bounded for any R.
+
+    Parameters:
+    -----------
+    x : array-like
+        The population to sample from (e.g. a pandas Series).
+        A 2-D array or DataFrame is sampled by whole rows.
+    n : int
+        The size of each sample, up to the size of x.
+    stat : str or function, optional, default='mean'
+        The statistic, as in `bootstrap`.
+    R : int, optional, default=1000
+        The number of samples.
+    rng : numpy.random.Generator or int, optional, default=None
+        The random number generator (or a seed for one). Defaults to fresh entropy.
+    chunk_cells : int, optional, default=2**22
+        The most indices to hold in memory at once.
+
+    Returns:
+    --------
+    numpy.ndarray
+        The statistic for each sample: R values (or R rows, for statistics with several values).
+
+    Examples:
+    ---------
+    # The sampling distribution of the mean, for samples of 100 counties
+    d = pd.DataFrame({'rep': range(1, 1000 + 1), 'mu': subsample(pop.air_pollution, n=100, R=1000)})
+    """
+    x = _sample(x)
+    N = len(x)
+    if not 1 <= n <= N:
+        raise ValueError("`n` must be between 1 and the size of x.")
+    reducer = _reducer(stat)
+    rng = np.random.default_rng(rng)
+    rows = max(1, chunk_cells // (N + n * _width(x)))
+    probe = np.asarray(reducer(x[np.zeros((1, n), dtype=np.intp)]))
+    output = np.empty((R,) + probe.shape[1:], dtype=probe.dtype)
+    for start in range(0, R, rows):
+        stop = min(start + rows, R)
+        output[start:stop] = reducer(x[_draw(N, n, stop - start, rng)])
+    return output
+
+def finite_population_se(x, n):
+    """
+    The standard error of the mean of a sample of size n, drawn without replacement from the population x.
+
+    This is the usual sd / sqrt(n), shrunk by the finite population correction sqrt(1 - n / N):
+    the bigger the share of the population a sample takes in, the less its mean can vary.
+
+    Parameters:
+    -----------
+    x : array-like
+        The full population.
+    n : int
+        The sample size.
+
+    Returns:
+    --------
+    float
+        The standard error, i.e. the standard deviation of the sample mean's sampling distribution.
+
+    Examples:
+    ---------
+    finite_population_se(pop.air_pollution, n=100)
+    """
+    x = np.ravel(np.asarray(x, dtype=float))
+    N = len(x)
+    if not 1 <= n <= N:
+        raise ValueError("`n` must be between 1 and the size of x.")
+    if N < 2:
+        return 0.0
+    return float(np.sqrt(x.var(ddof=1) / n * (1 - n / N)))
+
+# Confidence Intervals #############################
+
+# Leave-one-out (jackknife) statistics straight from running sums, in O(n):
+# dropping record i from a sum just subtracts it.
+def _jackknife_mean(x):
+    return (x.sum() - x) / (len(x) - 1)
+
+def _jackknife_var(x):
+    n, deviation = len(x), x - x.mean()
+    return ((deviation * deviation).sum() - deviation * deviation * n / (n - 1)) / (n - 2)
+
+def _jackknife_ratio(x):
+    return (x[:, 0].sum() - x[:, 0]) / (x[:, 1].sum() - x[:, 1])
+
+_JACKKNIFE = {
+    'mean': _jackknife_mean,
+    'sum': lambda x: x.sum() - x,
+    'var': _jackknife_var,
+    'sd': lambda x: np.sqrt(_jackknife_var(x)),
+    'ratio': _jackknife_ratio,
+}
+
+def jackknife(x, stat='mean', chunk_cells=2**22):
+    """
+    Compute the statistic with each record left out in turn (the jackknife).
+
+    For "mean", "sum", "var", "sd", and "ratio", each leave-one-out value comes straight from
+    the sample's sums, in O(n) total. Any other statistic is recomputed n times,
+    for blocks of leave-one-out samples at once.
+
+    Parameters:
+    -----------
+    x : array-like
+        The sample (2 columns, for stat="ratio").
+    stat : str or function, optional, default='mean'
+        The statistic, as in `bootstrap`.
+    chunk_cells : int, optional, default=2**22
+        The most values to hold in memory at once, for statistics without a shortcut.
+
+    Returns:
+    --------
+    numpy.ndarray
+        The n leave-one-out statistics.
+    """
+    x = _sample(x)
+    n = len(x)
+    if n < 3:
+        raise ValueError("Need at least 3 records to jackknife.")
+    if isinstance(stat, str) and stat in _JACKKNIFE:
+        return _JACKKNIFE[stat](x)
+    reducer = _reducer(stat)
+    rows = max(1, chunk_cells // (n * _width(x)))
+    keep = np.arange(n - 1)
+    output = np.empty(n)
+    for start in range(0, n, rows):
+        left_out = np.arange(start, min(start + rows, n))[:, None]
+        # Row i indexes every record but i
+        output[start:start + len(left_out)] = reducer(x[keep + (keep >= left_out)])
+    return output
+
+def interval(x, stat='mean', method='bca', level=0.95, R=2000, inner=50, rng=None, chunk_cells=2**22):
+    """
+    Bootstrap a confidence interval for a statistic.
+
+    Parameters:
+    -----------
+    x : array-like
+        The sample (2 columns, for stat="ratio").
+    stat : str or function, optional, default='mean'
+        The statistic, as in `bootstrap`. It must give a single value per replicate.
+    method : str, optional, default='bca'
+        "percentile": the middle `level` of the bootstrapped statistics.
+        "bca": bias-corrected and accelerated percentiles, which adjust for a skewed or biased statistic.
+        The acceleration comes from the jackknife (see `jackknife`).
+        "t": bootstrap-t (studentized) intervals, which standardize each replicate
+        by its own standard error, estimated from `inner` bootstraps of that replicate.
+    level : float, optional, default=0.95
+        The confidence level.
+    R : int, optional, default=2000
+        The number of bootstrap replicates.
+    inner : int, optional, default=50
+        For method="t", the number of inner bootstraps per replicate.
+    rng : numpy.random.Generator or int, optional, default=None
+        The random number generator (or a seed for one).
+    chunk_cells : int, optional, default=2**22
+        The most resampled values to hold in memory at once.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row, with the sample's 'estimate', the interval's 'lower' and 'upper' bounds, its 'method', and 'level'.
+
+    Examples:
+    ---------
+    interval(sample.air_pollution)
+    interval(sample.air_pollution, stat='median', method='t')
+    """
+    if method not in ('percentile', 'bca', 't'):
+        raise ValueError("`method` must be one of percentile, bca, t.")
+    if not 0 < level < 1:
+        raise ValueError("`level` must be between 0 and 1.")
+    x = _sample(x)
+    n = len(x)
+    reducer = _reducer(stat)
+    rng = np.random.default_rng(rng)
+    estimate = float(np.asarray(reducer(x[None]))[0])
+    alpha = (1 - level) / 2
+    if method == 't':
+        # Resample, then resample each resample `inner` times, all in blocks
+        rows = max(1, chunk_cells // (inner * n * _width(x)))
+        boot, se = np.empty(R), np.empty(R)
+        for start in range(0, R, rows):
+            stop = min(start + rows, R)
+            samples = x[rng.integers(0, n, size=(stop - start, n))]
+            boot[start:stop] = reducer(samples)
+            index = rng.integers(0, n, size=(stop - start, inner, n))
+            resamples = samples[np.arange(stop - start)[:, None, None], index]
+            inner_stats = np.asarray(reducer(resamples.reshape((-1,) + samples.shape[1:])))
+            se[start:stop] = inner_stats.reshape(stop - start, inner).std(axis=1, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (boot - estimate) / se
+        t = t[np.isfinite(t)]
+        spread = boot.std(ddof=1)
+        upper_t, lower_t = np.quantile(t, [1 - alpha, alpha])
+        lower, upper = estimate - upper_t * spread, estimate - lower_t * spread
+    else:
+        boot = bootstrap(x, stat=stat, R=R, rng=rng, chunk_cells=chunk_cells)
+        probs = np.array([alpha, 1 - alpha])
+        if method == 'bca':
+            # Bias correction: how far the replicates' median sits from the estimate
+            z0 = special.ndtri((np.count_nonzero(boot < estimate) + 0.5 * np.count_nonzero(boot == estimate)) / R)
+            # Acceleration: the skewness of the jackknife values
+            deviation = jackknife(x, stat=stat, chunk_cells=chunk_cells)
+            deviation = deviation.mean() - deviation
+            spread = (deviation * deviation).sum()
+            a = (deviation**3).sum() / (6 * spread**1.5) if spread > 0 else 0.0
+            z = special.ndtri(probs)
+            probs = special.ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+        lower, upper = np.quantile(boot, probs)
+    output = pd.DataFrame({'estimate': [estimate], 'lower': [lower], 'upper': [upper],
+                           'method': [method], 'level': [level]})
+    return output
+
+# Online Bootstrap #################################
+
+class PoissonBootstrap:
+    """
+    Bootstrap a stream of data in one pass, for data too big to hold in memory.
+
+    Rather than resampling, every record gets a random weight, drawn from a Poisson(1) distribution,
+    in each of R replicates: the number of times it would have been picked in that resample (on average, once).
+    Each replicate keeps only its running weighted sums, so memory stays O(R) however much data streams through.
+
+    Parameters:
+    -----------
+    R : int, optional, default=1000
+        The number of replicates.
+    rng : numpy.random.Generator or int, optional, default=None
+        The random number generator (or a seed for one). Defaults to fresh entropy.
+    chunk_cells : int, optional, default=2**22
+        The most weights to hold in memory at once (records x replicates).
+
+    Attributes:
+    -----------
+    weight : numpy.ndarray
+        Each replicate's total weight (its resample size).
+    mean, var : numpy.ndarray
+        Each replicate's weighted mean and variance of x.
+    ratio : numpy.ndarray
+        Each replicate's ratio of the weighted sums of x and y (e.g. a rate per capita), if y was given.
+
+    Examples:
+    ---------
+    boot = PoissonBootstrap(R=1000, rng=1)
+    for chunk in pd.read_csv("E/environmental_health.csv", chunksize=500):
+        chunk = chunk.dropna(subset=['air_pollution'])
+        boot.update(chunk.air_pollution)
+    boot.mean   # 1000 bootstrapped means
+    """
+
+    def __init__(self, R=1000, rng=None, chunk_cells=2**22):
+        self.rng = np.random.default_rng(rng)
+        self.chunk_cells = chunk_cells
+        self.weight = np.zeros(R)
+        self._mean = np.zeros(R)
+        self.m2 = np.zeros(R)
+        self.sum_y = np.zeros(R)
+
+    def update(self, x, y=None):
+        """
+        Add a chunk of records: values x and, for ratios, their denominators y.
+        """
+        x = np.ravel(np.asarray(x, dtype=float))
+        y = None if y is None else np.ravel(np.asarray(y, dtype=float))
+        R = len(self.weight)
+        rows = max(1, self.chunk_cells // R)
+        for start in range(0, len(x), rows):
+            block = x[start:start + rows]
+            weights = self.rng.poisson(1.0, size=(R, len(block))).astype(float)
+            # Center on the block's own mean, so the weighted sums of squares stay accurate
+            center = block.mean()
+            deviation = block - center
+            weight = weights.sum(axis=1)
+            total = weights @ deviation
+            m2 = weights @ (deviation * deviation)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.where(weight > 0, total / weight, 0.0)
+            m2 -= total * mean
+            self._merge(weight, mean + center, m2)
+            if y is not None:
+                self.sum_y += weights @ y[start:start + rows]
+        return self
+
+    def _merge(self, weight, mean, m2):
+        # Pairwise update of weighted means and sums of squares (Chan et al.)
+        total = self.weight + weight
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = mean - self._mean
+            share = np.where(total > 0, weight / total, 0.0)
+            self.m2 += m2 + delta * delta * self.weight * share
+        self._mean += delta * share
+        self.weight = total
+
+    def merge(self, other):
+        """
+        Fold another PoissonBootstrap with the same R (e.g. from another worker, over other data) into this one.
+        """
+        self._merge(other.weight, other._mean, other.m2)
+        self.sum_y += other.sum_y
+        return self
+
+    @property
+    def mean(self):
+        """Each replicate's weighted mean."""
+        return np.where(self.weight > 0, self._mean, np.nan)
+
+    @property
+    def var(self):
+        """Each replicate's weighted variance (dividing by the total weight - 1, like pandas)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.weight > 1, self.m2 / (self.weight - 1), np.nan)
+
+    @property
+    def ratio(self):
+        """Each replicate's sum of weighted x over sum of weighted y."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._mean * self.weight / self.sum_y
+
+def poisson_bootstrap(chunks, column, stat='mean', R=1000, denominator=None, rng=None):
+    """
+    Bootstrap a statistic of a column in one pass over chunked data (see `PoissonBootstrap`).
+
+    Parameters:
+    -----------
+    chunks : iterable of pandas.DataFrame
+        The data, a chunk at a time, e.g. pd.read_csv(path, chunksize=10**5).
+    column : str
+        The column to bootstrap.
+    stat : str, optional, default='mean'
+        "mean", "var", "sd", or "ratio" (the sum of `column` over the sum of `denominator`).
+    R : int, optional, default=1000
+        The number of replicates.
+    denominator : str, optional, default=None
+        For stat="ratio", the column to divide by.
+    rng : numpy.random.Generator or int, optional, default=None
+        The random number generator (or a seed for one).
+
+    Returns:
+    --------
+    numpy.ndarray
+        The statistic for each of the R replicates.
+        Rows missing `column` (or `denominator`) are skipped.
+
+    Examples:
+    ---------
+    poisson_bootstrap(pd.read_csv("E/environmental_health.csv", chunksize=500), 'air_pollution', R=1000)
+    """
+    if stat not in ('mean', 'var', 'sd', 'ratio'):
+        raise ValueError("`stat` must be one of mean, var, sd, ratio.")
+    if stat == 'ratio' and denominator is None:
+        raise ValueError("stat='ratio' needs a `denominator` column.")
+    columns = [column] if denominator is None else [column, denominator]
+    boot = PoissonBootstrap(R=R, rng=rng)
+    for chunk in chunks:
+        chunk = chunk[columns].dropna()
+        boot.update(chunk[column], None if denominator is None else chunk[denominator])
+    if stat == 'sd':
+        return np.sqrt(boot.var)
+    output = getattr(boot, stat)
+    return output
+
+# Result Cache #####################################
+
+# The arguments that seed a function's random numbers
+_SEEDS = ('rng', 'seed', 'random_state')
+
+# Functions known not to return arrays of numbers, so the cache can refuse them before running them
+_NOT_ARRAYS = (interval,)
+
+# Digests of module source files, by path, modification time, and size
+_sources = {}
+
+def _source(module):
+    """
+    A digest of the source file of an imported module (e.g. this one), so editing any helper
+    a cached function calls starts a fresh cache. Returns b'' for scripts run directly
+    (__main__) and modules without a source file, whose functions are keyed by their own code alone.
+    """
+    if module in (None, '__main__') or module not in sys.modules:
+        return b''
+    path = getattr(sys.modules[module], '__file__', None)
+    if path is None or not path.endswith('.py'):
+        return b''
+    try:
+        info = os.stat(path)
+    except OSError:
+        return b''
+    key = (path, info.st_mtime_ns, info.st_size)
+    if key not in _sources:
+        with open(path, 'rb') as f:
+            _sources[key] = hashlib.blake2b(f.read(), digest_size=20).digest()
+    return _sources[key]
+
+def _digest(h, value):
+    """
+    Feed a canonical encoding of `value` into the hash `h`: arrays by their contents,
+    functions by their name and code, and containers element by element.
+    """
+    if isinstance(value, pd.DataFrame):
+        h.update(b'frame')
+        _digest(h, [str(column) for column in value.columns])
+        value = value.to_numpy()
+    elif isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray):
+        h.update(f'array{value.dtype.str}{value.shape}'.encode())
+        if value.dtype == object:
+            _digest(h, value.tolist())
+        else:
+            h.update(np.ascontiguousarray(value).view(np.uint8).ravel())
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        h.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _digest(h, item)
+    elif isinstance(value, dict):
+        h.update(f'dict{len(value)}'.encode())
+        for name in sorted(value, key=repr):
+            _digest(h, name)
+            _digest(h, value[name])
+    elif isinstance(value, partial):
+        # A partial: the function it wraps, and the arguments it already fills in
+        h.update(b'partial')
+        _digest(h, value.func)
+        _digest(h, value.args)
+        _digest(h, value.keywords)
+    elif hasattr(value, '__func__') and hasattr(value, '__self__'):
+        # A bound method: the object it's bound to matters as much as the method
+        h.update(b'method')
+        _digest(h, value.__self__)
+        _digest(h, value.__func__)
+    elif hasattr(value, '__code__'):
+        # A Python function: its name, its code (so editing it starts a fresh cache), and anything it closes over
+        h.update(f'function{value.__module__}.{value.__qualname__}'.encode())
+        h.update(marshal.dumps(value.__code__))
+        h.update(_source(value.__module__))
+        _digest(h, value.__defaults__)
+        _digest(h, value.__kwdefaults__)
+        _digest(h, [cell.cell_contents for cell in value.__closure__ or ()])
+    elif isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+        # A builtin function or ufunc
+        h.update(f'builtin{getattr(value, "__module__", None)}.{value.__name__}'.encode())
+    elif isinstance(value, type) and not _plain(value):
+        # A builtin class (e.g. dtype=float)
+        h.update(f'type{value.__module__}.{value.__qualname__}'.encode())
+    elif isinstance(value, type):
+        h.update(b'class')
+        _class(h, value)
+    elif _plain(type(value)):
+        # Any other object of a Python class (e.g. a reducer from quantile()), by its class and attributes
+        h.update(b'object')
+        _class(h, type(value))
+        _digest(h, vars(value))
+    else:
+        # Objects with state outside their __dict__ (e.g. C extension types) can't be keyed reliably
+        raise TypeError(f"Can't make a cache key from a {type(value).__name__}.")
+
+def _plain(cls):
+    """
+    Whether instances of `cls` keep all their state in their __dict__:
+    every class it inherits from (besides object) is defined in Python, without __slots__.
+    """
+    return all(klass.__flags__ & (1 << 9) and '__slots__' not in vars(klass)
+               for klass in cls.__mro__[:-1])
+
+def _class(h, cls):
+    """
+    Feed a Python class's name and code into the hash `h`: the source of the module it was imported from,
+    or, for classes defined in the script being run, the code of each of its methods.
+    """
+    h.update(f'{cls.__module__}.{cls.__qualname__}'.encode())
+    for klass in cls.__mro__[:-1]:
+        source = _source(klass.__module__)
+        if source:
+            h.update(source)
+            continue
+        for name, attribute in sorted(vars(klass).items()):
+            if hasattr(attribute, '__code__'):
+                h.update(name.encode())
+                h.update(marshal.dumps(attribute.__code__))
+
+def _numbers(value):
+    """
+    A result as a numpy array of numbers, or a TypeError if it isn't one.
+    """
+    try:
+        array = np.array(value)
+    except ValueError:
+        # e.g. a tuple of arrays of different lengths
+        array = np.array(None)
+    if array.dtype.kind not in 'biufc':
+        raise TypeError(f"ResultCache can only save arrays of numbers, not a {type(value).__name__}.")
+    return array
+
+class ResultCache:
+    """
+    Save the results of bootstrap and simulation runs to disk, and load them back
+    instead of recomputing them when the same run comes up again.
+
+    A run is identified by a hash of the function (its name, its code, and the source of the module
+    it was imported from), the contents of its input arrays, and all its other arguments, including the seed.
+    Runs without a fixed integer seed (rng, seed, or random_state) give different results every time,
+    so they always run and are never saved.
+
+    Only functions that return arrays of numbers (e.g. `bootstrap`, `subsample`) can be cached.
+    Results are saved as .npy files, and loaded back as read-only memory-mapped arrays,
+    so a hit costs about as much as opening a file. Once the saved results take up more than `max_bytes`,
+    the least recently used ones are deleted.
+
+    Parameters:
+    -----------
+    directory : str, optional, default='.bootstrap_cache'
+        The folder to save results in. It's created if it doesn't exist.
+    max_bytes : int, optional, default=2**30
+        The most disk space (in bytes) for saved results to take up. Defaults to 1 GB.
+
+    Examples:
+    ---------
+    cache = ResultCache("E/.cache")
+    # Runs the bootstrap the first time, then loads it from disk every time after
+    cache(bootstrap, pop.air_pollution, stat="mean", R=100000, n=100, rng=12345)
+    """
+    def __init__(self, directory='.bootstrap_cache', max_bytes=2**30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"ResultCache(directory={self.directory!r}, max_bytes={self.max_bytes})"
+
+    def key(self, fun, *args, **kwargs):
+        """
+        The key for the run fun(*args, **kwargs), or None if it has no fixed seed, and can't be saved.
+        """
+        try:
+            bound = signature(fun).bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+        except (TypeError, ValueError):
+            arguments = {'args': args, **kwargs}
+        for name in _SEEDS:
+            if name in arguments and not isinstance(arguments[name], (int, np.integer)):
+                return None
+        h = hashlib.blake2b(digest_size=20)
+        _digest(h, fun)
+        _digest(h, arguments)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npy')
+
+    def get(self, key):
+        """
+        Load the result saved under `key` (memory-mapped, read-only), or None if there isn't one.
+        """
+        path = self._path(key)
+        try:
+            # Touch the file, to mark it as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        try:
+            return np.load(path, mmap_mode='r')
+        except ValueError:
+            # Empty arrays can't be memory-mapped
+            return np.load(path)
+
+    def put(self, key, value):
+        """
+        Save a result (a numpy array of numbers) under `key`, then make room if the cache is over its limit.
+        """
+        array = _numbers(value)
+        path = self._path(key)
+        # Write to a temporary file, then swap it in, so a crash never leaves half a result behind
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Delete the least recently used results until the cache fits in `max_bytes`.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npy'):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                # Still open somewhere (e.g. memory-mapped on Windows); leave it for next time
+                pass
+
+    def clear(self):
+        """
+        Delete every saved result.
+        """
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npy'):
+                os.remove(entry.path)
+
+    def __call__(self, fun, *args, **kwargs):
+        """
+        Return fun(*args, **kwargs) as a read-only numpy array, loading it from disk if this run
+        was saved before, or running and saving it if not.
+        """
+        if fun in _NOT_ARRAYS:
+            raise TypeError(f"ResultCache can only cache functions that return arrays of numbers, not {fun.__name__}().")
+        key = self.key(fun, *args, **kwargs)
+        if key is not None:
+            output = self.get(key)
+            if output is not None:
+                return output
+        output = _numbers(fun(*args, **kwargs))
+        if key is not None:
+            self.put(key, output)
+            # Hand back the saved copy, just as a hit would (unless it was too big to keep)
+            saved = self.get(key)
+            if saved is not None:
+                return saved
+        output.flags.writeable = False
+        return output
@@ -0,0 +1,41 @@
+# test_bootstrap.py
+# Checks that ResultCache keys runs by everything that changes their results.
+# Run with:
+#   python -m pytest E/test_bootstrap.py
+from functools import partial
+import numpy as np
+import pytest
+from bootstrap import ResultCache, bootstrap, quantile
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path))
+
+@pytest.fixture
+def x():
+    return np.random.default_rng(1).normal(50, 5, size=100)
+
+def test_partials_over_different_data(cache, x):
+    assert cache.key(partial(bootstrap, x), R=5, rng=1) != cache.key(partial(bootstrap, x + 1000), R=5, rng=1)
+    a = cache(partial(bootstrap, x), R=5, rng=1)
+    b = cache(partial(bootstrap, x + 1000), R=5, rng=1)
+    np.testing.assert_allclose(b - a, 1000)
+
+def test_reducers_with_different_settings(cache, x):
+    assert cache.key(bootstrap, x, stat=quantile(0.5), rng=1) != cache.key(bootstrap, x, stat=quantile(0.6), rng=1)
+
+def test_unhashable_state_raises(cache, x):
+    # A Generator keeps its state outside its __dict__, so it can't be keyed
+    with pytest.raises(TypeError):
+        cache.key(bootstrap, x, stat=np.random.default_rng(1), rng=1)
+
+def test_caller_errors_dont_block_later_calls(cache, x):
+    with pytest.raises(TypeError):
+        cache(bootstrap, x, R='10', rng=1)
+    assert cache(bootstrap, x, R=10, rng=1).shape == (10,)
+
+def test_hit_matches_miss(cache, x):
+    miss = cache(bootstrap, x, R=10, rng=1)
+    hit = cache(bootstrap, x, R=10, rng=1)
+    assert type(miss) is type(hit)
+    np.testing.assert_array_equal(miss, hit)
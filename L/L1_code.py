@@ -51,12 +51,20 @@
 
 
 # Load Packages
+import os
+import sys
 import pandas as pd
 from plotnine import *
 import statsmodels.api as sm
 # Import these functions from scipy.stats package
 from scipy.stats import norm
 
+# We'll also use ResultCache from module E's bootstrap.py,
+# to save our simulations to disk, so re-running this script loads them back instead
+sys.path.append(os.path.abspath('E'))
+from bootstrap import ResultCache
+cache = ResultCache("L/.cache")
+
 # Load data - county outcomes and traits in 2019
 counties = pd.read_csv("L/food_deserts.csv")
 
@@ -177,11 +185,17 @@ sims['id'] = pd.Series( range(1, len(sims) + 1) ) # throws an error, but works
 
 sims
 
-# For each scenario, simulate error using 1000 simulations
-sims = sims.groupby( ['id', 'pop_black'] ).apply(lambda df: pd.Series({
-  'yhat': df.yhat.values[0],
-  'error': norm.rvs(loc = 0, scale = df.se, size = 1000) 
-})).reset_index()
+# For each scenario, simulate error using 1000 simulations.
+# This function draws them all at once: one row of 1000 per scenario,
+# each with that scenario's standard error.
+def simulate_error(se, n, seed):
+  return norm.rvs(loc = 0, scale = se[:, None], size = (len(se), n), random_state = seed)
+
+# Run it through our cache, with a fixed seed, so the same draws get reused next time
+error = cache(simulate_error, se = sims.se.values, n = 1000, seed = 12345)
+
+# Give each scenario its row of errors
+sims = sims[ ['id', 'pop_black', 'yhat'] ].assign(error = list(error))
 
 sims
 
@@ -169,6 +169,12 @@ g1
 # Then view it!
 g1 + xlim(0,10)
 
+# We can also put numbers on "which fits best?" without simulating anything.
+# rank_fits() fits each distribution to sw and scores how well it fits:
+# lower AIC and BIC (penalized log-likelihood) and lower KS and AD
+# (gaps between the data and the fitted CDF) mean a better fit.
+rank_fits(sw)
+
 
 # Yay! Be sure to complete the learning checks to test out your knowledge.
 # Great work!
@@ -0,0 +1,233 @@
+# benchmarks.py
+# Timing benchmarks for distributions.py, to catch speed regressions.
+#
+# Run the benchmarks and save the results:
+#   python O/benchmarks.py run --output before.json
+# Run them again after a change, then compare the two:
+#   python O/benchmarks.py run --output after.json
+#   python O/benchmarks.py compare before.json after.json --threshold 0.10
+#
+# Each benchmark is timed next to a raw scipy/numpy baseline doing the same job,
+# so you can see both how fast our functions are and how much they add on top.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import scipy
+from scipy import stats
+from scipy.interpolate import interp1d
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import distributions as dist
+
+# Benchmark Cases ##################################
+
+SIZES = [10, 100, 1000, 10**4, 10**5, 10**6, 10**7]
+
+# Skip a baseline once it would take more than this many operations (e.g. a KDE evaluated exactly)
+MAX_BASELINE_CELLS = 10**9
+
+# Each family pairs the parameters we benchmark with, the matching frozen scipy distribution,
+# and a numpy function to make realistic inputs for the d and p functions.
+FAMILIES = {
+    'norm': (dict(mean=0, sd=1), stats.norm(0, 1), lambda rng, n: rng.normal(size=n)),
+    'exp': (dict(rate=1), stats.expon(scale=1), lambda rng, n: rng.exponential(size=n)),
+    'weibull': (dict(shape=2, scale=1), stats.weibull_min(2, scale=1), lambda rng, n: rng.weibull(2, size=n)),
+    'gamma': (dict(shape=2, rate=1), stats.gamma(2, scale=1), lambda rng, n: rng.gamma(2, size=n)),
+    'pois': (dict(mu=4), stats.poisson(4), lambda rng, n: rng.poisson(4, size=n)),
+    'binom': (dict(size=10, prob=0.3), stats.binom(10, 0.3), lambda rng, n: rng.binomial(10, 0.3, size=n)),
+    'unif': (dict(min=0, max=1), stats.uniform(0, 1), lambda rng, n: rng.uniform(size=n)),
+}
+
+def _distribution_cases():
+    """
+    Yield (name, make) for every d/p/q/r function, where make(n, rng) returns
+    a (function, baseline) pair of zero-argument callables.
+    """
+    for family, (params, frozen, sample) in FAMILIES.items():
+        density = frozen.pmf if hasattr(frozen, 'pmf') else frozen.pdf
+
+        def make_d(n, rng, family=family, params=params, density=density, sample=sample):
+            x = sample(rng, n)
+            fun = getattr(dist, 'd' + family)
+            return (lambda: fun(x, **params)), (lambda: density(x))
+
+        def make_p(n, rng, family=family, params=params, frozen=frozen, sample=sample):
+            x = sample(rng, n)
+            fun = getattr(dist, 'p' + family)
+            return (lambda: fun(x, **params)), (lambda: frozen.cdf(x))
+
+        def make_q(n, rng, family=family, params=params, frozen=frozen):
+            p = rng.uniform(size=n)
+            fun = getattr(dist, 'q' + family)
+            return (lambda: fun(p, **params)), (lambda: frozen.ppf(p))
+
+        def make_r(n, rng, family=family, params=params, frozen=frozen):
+            fun = getattr(dist, 'r' + family)
+            return (lambda: fun(n, **params, rng=rng)), (lambda: frozen.rvs(size=n, random_state=rng))
+
+        yield 'd' + family, make_d
+        yield 'p' + family, make_p
+        yield 'q' + family, make_q
+        yield 'r' + family, make_r
+
+def _make_seq(n, rng):
+    return (lambda: dist.seq(0, 1, length_out=n)), (lambda: np.linspace(0, 1, n))
+
+def _make_density(n, rng):
+    x = rng.normal(size=n)
+    return (lambda: dist.density(x)), (lambda: stats.gaussian_kde(x))
+
+def _make_tidy_density(n, rng):
+    model = dist.density(rng.normal(size=n))
+    grid = np.linspace(model.dataset.min(), model.dataset.max(), 1000)
+    baseline = (lambda: model(grid)) if n * len(grid) <= MAX_BASELINE_CELLS else None
+    return (lambda: dist.tidy_density(model)), baseline
+
+def _make_approxfun(n, rng):
+    data = pd.DataFrame({'x': np.linspace(0, 1, 1000)})
+    data['y'] = np.sin(data.x)
+    f = dist.approxfun(data)
+    g = interp1d(data.x, data.y, fill_value='extrapolate', bounds_error=False)
+    x = rng.uniform(-0.1, 1.1, size=n)
+    return (lambda: f(x)), (lambda: g(x))
+
+def _make_skewness(n, rng):
+    x = rng.normal(size=n)
+    return (lambda: dist.skewness(x)), (lambda: stats.skew(x, bias=False))
+
+def _make_kurtosis(n, rng):
+    x = rng.normal(size=n)
+    return (lambda: dist.kurtosis(x)), (lambda: stats.kurtosis(x, bias=False))
+
+CASES = dict(_distribution_cases())
+CASES.update({
+    'seq': _make_seq,
+    'density': _make_density,
+    'tidy_density': _make_tidy_density,
+    'approxfun': _make_approxfun,
+    'skewness': _make_skewness,
+    'kurtosis': _make_kurtosis,
+})
+
+# Timing ###########################################
+
+def timeit(fun, repeat=5, budget=0.05):
+    """
+    Time a zero-argument function, returning the best seconds per call.
+
+    Fast functions are looped until each measurement takes at least `budget` seconds,
+    so the clock's resolution doesn't swamp them; the best of `repeat` measurements is kept,
+    since anything slower was just interference from the rest of the machine.
+    """
+    fun()  # warm up caches, lazy imports, etc.
+    start = time.perf_counter()
+    fun()
+    elapsed = time.perf_counter() - start
+    loops = max(1, int(budget / max(elapsed, 1e-9)))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fun()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def run(names=None, sizes=SIZES, repeat=5, seed=1, output=None):
+    """
+    Run the benchmarks, print a table as they go, and return (and optionally save) the results.
+    """
+    names = list(CASES) if names is None else names
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError("Unknown benchmark(s): " + ", ".join(unknown) + ". Choose from: " + ", ".join(CASES))
+    results = []
+    print(f"{'benchmark':<14}{'n':>10}{'seconds':>14}{'baseline':>14}{'ratio':>8}")
+    for name in names:
+        for n in sizes:
+            rng = np.random.default_rng(seed)
+            fun, baseline = CASES[name](n, rng)
+            seconds = timeit(fun, repeat=repeat)
+            baseline_seconds = timeit(baseline, repeat=repeat) if baseline is not None else None
+            ratio = seconds / baseline_seconds if baseline_seconds else None
+            results.append({'name': name, 'n': n, 'seconds': seconds,
+                            'baseline_seconds': baseline_seconds, 'ratio': ratio})
+            print(f"{name:<14}{n:>10}{seconds:>14.3e}"
+                  + (f"{baseline_seconds:>14.3e}{ratio:>8.2f}" if ratio is not None else f"{'-':>14}{'-':>8}"))
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'pandas': pd.__version__,
+            'return_type': dist._options['return_type'],
+            'backend': dist._options['backend'],
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+# Comparing Runs ###################################
+
+def compare(old, new, threshold=0.10):
+    """
+    Compare two saved result files, printing the change in time for every benchmark they share.
+
+    Returns a list of the (name, n, change) that got slower by more than `threshold`
+    (e.g. 0.10 = 10% slower).
+    """
+    with open(old) as f:
+        before = {(r['name'], r['n']): r['seconds'] for r in json.load(f)['results']}
+    with open(new) as f:
+        after = {(r['name'], r['n']): r['seconds'] for r in json.load(f)['results']}
+    slower = []
+    print(f"{'benchmark':<14}{'n':>10}{'old':>14}{'new':>14}{'change':>10}")
+    order = {name: i for i, name in enumerate(CASES)}
+    for key in sorted(before.keys() & after.keys(), key=lambda key: (order.get(key[0], len(order)), key)):
+        change = after[key] / before[key] - 1
+        flag = ''
+        if change > threshold:
+            slower.append((key[0], key[1], change))
+            flag = '  SLOWER'
+        print(f"{key[0]:<14}{key[1]:>10}{before[key]:>14.3e}{after[key]:>14.3e}{change:>+10.1%}{flag}")
+    unmatched = len(before.keys() ^ after.keys())
+    if unmatched:
+        print(f"\n{unmatched} benchmark(s) were only in one of the files, and weren't compared.")
+    print(f"\n{len(slower)} benchmark(s) more than {threshold:.0%} slower.")
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark distributions.py.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="time the benchmarks")
+    run_parser.add_argument('names', nargs='*', help="benchmarks to run (default: all), e.g. dnorm seq")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="input sizes")
+    run_parser.add_argument('--repeat', type=int, default=5, help="measurements per benchmark")
+    run_parser.add_argument('--seed', type=int, default=1, help="random seed for the inputs")
+    run_parser.add_argument('--output', help="JSON file to save the results to")
+    compare_parser = commands.add_parser('compare', help="compare two saved runs")
+    compare_parser.add_argument('old', help="JSON results from before")
+    compare_parser.add_argument('new', help="JSON results from after")
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="flag benchmarks slower by more than this fraction (default 0.10)")
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run(args.names or None, sizes=args.sizes, repeat=args.repeat, seed=args.seed, output=args.output)
+        return 0
+    # Exit with an error when anything got slower, so this can gate a CI job
+    return 1 if compare(args.old, args.new, threshold=args.threshold) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,48 +2,1692 @@
 # Installation requirements
 # !pip install scipy # import scipy functions
 # !pip install plotnine # import visualization functions
-# from scipy.stats import norm, expon, gamma, weibull_min, poisson, uniform, binom
+from collections import OrderedDict, deque
+from functools import lru_cache
+from inspect import signature
+from itertools import islice
+from math import isfinite
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from scipy import stats, special
+
+# What `from distributions import *` brings in: the functions below, but not the modules they use
+__all__ = [
+    # Settings
+    'clear_cache', 'set_return_type', 'set_backend', 'set_quantiles', 'set_seed', 'spawn',
+    # Distribution functions
+    'dnorm', 'pnorm', 'qnorm', 'rnorm', 'dexp', 'pexp', 'qexp', 'rexp',
+    'dweibull', 'pweibull', 'qweibull', 'rweibull', 'dgamma', 'pgamma', 'qgamma', 'rgamma',
+    'dpois', 'ppois', 'qpois', 'rpois', 'dbinom', 'pbinom', 'qbinom', 'rbinom',
+    'dunif', 'punif', 'qunif', 'runif',
+    'Distribution', 'Normal', 'Exponential', 'Weibull', 'Gamma', 'Poisson', 'Binomial', 'Uniform',
+    # Likelihood and fitting
+    'Sufficient', 'sufficient', 'loglik', 'fitdistr', 'rank_fits',
+    # Descriptive statistics and visualization
+    'hist', 'Histogram', 'QuantileSketch', 'Moments', 'skewness', 'kurtosis',
+    'LazySeq', 'seq', 'density', 'tidy_density', 'Interpolator', 'approxfun', 'exp',
+    # Working in chunks
+    'sweep', 'stream', 'consume',
+]
+
+# Frozen Distribution Cache ########################
+
+# Each family pairs a scipy distribution with a translation
+# from our R-style parameters to scipy's keyword arguments.
+_FAMILIES = {
+    'norm': (stats.norm, lambda mean, sd: {'loc': mean, 'scale': sd}),
+    'exp': (stats.expon, lambda rate: {'loc': 0, 'scale': 1 / rate}),
+    'weibull': (stats.weibull_min, lambda shape, scale: {'c': shape, 'scale': scale}),
+    'gamma': (stats.gamma, lambda shape, rate: {'a': shape, 'scale': 1 / rate}),
+    'pois': (stats.poisson, lambda mu: {'mu': mu}),
+    'binom': (stats.binom, lambda size, prob: {'n': size, 'p': prob}),
+    'unif': (stats.uniform, lambda min, max: {'loc': min, 'scale': max - min}),
+}
+
+# Maximum number of frozen distributions kept around between calls
+CACHE_SIZE = 256
+
+def _freeze(family, params):
+    dist, translate = _FAMILIES[family]
+    return dist(**translate(*params))
+
+_frozen = lru_cache(maxsize=CACHE_SIZE)(_freeze)
+
+def _dist(family, *params):
+    """
+    Get a frozen scipy distribution for `family` with R-style `params`.
+
+    Parameter sets we have seen recently come straight out of an LRU cache,
+    so repeated calls with the same handful of parameters skip building a new distribution.
+    Unhashable parameters (e.g. arrays) can't be cached, so they get a fresh distribution.
+    """
+    try:
+        return _frozen(family, params)
+    except TypeError:
+        return _freeze(family, params)
+
+def clear_cache():
+    """
+    Empty the caches of frozen distributions and quantile tables.
+    """
+    _frozen.cache_clear()
+    _gamma_table.cache_clear()
+    _discrete_tables.clear()
+    _discrete_demand.clear()
+    _discrete_bytes[0] = 0
+
+# Output Format ####################################
+
+# What the d/p/q/r functions hand back:
+# "series" for a pandas Series, or "ndarray" for a bare numpy array (no index, no copy).
+_RETURN_TYPES = ('series', 'ndarray')
+_options = {'return_type': 'series', 'backend': 'fast'}
+
+def set_return_type(return_type='series'):
+    """
+    Choose what the d/p/q/r functions return, for the whole module.
+
+    Parameters:
+    -----------
+    return_type : str, optional, default='series'
+        Either "series" (a pandas Series, the default) or "ndarray" (a numpy array).
+        numpy arrays skip building a pandas index and copying the values on every call.
+
+    Returns:
+    --------
+    str
+        The previous return type, so you can switch back when you're done.
+
+    Examples:
+    ---------
+    old = set_return_type("ndarray")
+    dnorm([0, 1, 2])   # array([0.39894228, 0.24197072, 0.05399097])
+    set_return_type(old)
+    """
+    if return_type not in _RETURN_TYPES:
+        raise ValueError("`return_type` must be one of " + ", ".join(_RETURN_TYPES) + ".")
+    previous = _options['return_type']
+    _options['return_type'] = return_type
+    return previous
+
+def _output(values, out=None):
+    """
+    Package computed values the way the caller asked for them.
+    If `out` is given, write the values into it in place and return it;
+    otherwise return a Series or ndarray depending on the module's return type.
+    """
+    if out is not None:
+        if values is not out:
+            out[...] = values
+        return out
+    if _options['return_type'] == 'ndarray':
+        return np.asarray(values)
+    # The values are always freshly computed, so the Series can wrap them without a copy
+    return pd.Series(values, copy=False)
+
+# Fast Kernels #####################################
+
+# Closed-form versions of the common d/p/q functions, written with numpy ufuncs
+# (and scipy.special where there's no elementary form), so they skip scipy.stats'
+# argument checking and broadcasting. Each writes its results into `out`,
+# an array already shaped like the broadcast of x and the parameters.
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+def _dnorm(x, mean, sd, out):
+    np.subtract(x, mean, out=out)
+    out /= sd
+    np.square(out, out=out)
+    out *= -0.5
+    np.exp(out, out=out)
+    out /= sd * _SQRT_2PI
+
+def _pnorm(x, mean, sd, out):
+    np.subtract(x, mean, out=out)
+    out /= sd
+    special.ndtr(out, out=out)
+
+def _qnorm(x, mean, sd, out):
+    special.ndtri(x, out=out)
+    out *= sd
+    out += mean
+
+def _dexp(x, rate, out):
+    np.multiply(x, -rate, out=out)
+    np.exp(out, out=out)
+    out *= rate
+    out[x < 0] = 0
+
+def _pexp(x, rate, out):
+    np.multiply(x, -rate, out=out)
+    np.expm1(out, out=out)
+    np.negative(out, out=out)
+    out[x < 0] = 0
+
+def _qexp(x, rate, out):
+    np.negative(x, out=out)
+    np.log1p(out, out=out)
+    out /= -rate
+    out[(x < 0) | (x > 1)] = np.nan
+
+def _dweibull(x, shape, scale, out):
+    np.divide(x, scale, out=out)
+    tail = np.exp(-np.power(out, shape))
+    np.power(out, shape - 1, out=out)
+    out *= tail
+    out *= shape / scale
+    out[x < 0] = 0
+
+def _pweibull(x, shape, scale, out):
+    np.divide(x, scale, out=out)
+    np.power(out, shape, out=out)
+    np.negative(out, out=out)
+    np.expm1(out, out=out)
+    np.negative(out, out=out)
+    out[x < 0] = 0
+
+def _qweibull(x, shape, scale, out):
+    np.negative(x, out=out)
+    np.log1p(out, out=out)
+    np.negative(out, out=out)
+    np.power(out, 1 / shape, out=out)
+    out *= scale
+    out[(x < 0) | (x > 1)] = np.nan
+
+def _dunif(x, min, max, out):
+    out[...] = 1 / (max - min)
+    out[(x < min) | (x > max)] = 0
+    out[np.isnan(x)] = np.nan
+
+def _punif(x, min, max, out):
+    np.subtract(x, min, out=out)
+    out /= max - min
+    np.clip(out, 0, 1, out=out)
+
+def _qunif(x, min, max, out):
+    np.multiply(x, max - min, out=out)
+    out += min
+    out[(x < 0) | (x > 1)] = np.nan
+
+# Upper tails (s, for survival) and log probabilities, for lower_tail=False and log_p=True.
+# Each is computed directly, rather than as 1 - p or log(p), so it stays accurate far out in the tails.
+
+def _log1mexp(out):
+    """
+    Replace a (>= 0) in `out` with log(1 - exp(-a)), accurately for small and large a alike.
+    """
+    small = out <= np.log(2)
+    out[small] = np.log(-np.expm1(-out[small]))
+    out[~small] = np.log1p(-np.exp(-out[~small]))
+
+def _snorm(x, mean, sd, out):
+    np.subtract(mean, x, out=out)
+    out /= sd
+    special.ndtr(out, out=out)
+
+def _logpnorm(x, mean, sd, out):
+    np.subtract(x, mean, out=out)
+    out /= sd
+    special.log_ndtr(out, out=out)
+
+def _logsnorm(x, mean, sd, out):
+    np.subtract(mean, x, out=out)
+    out /= sd
+    special.log_ndtr(out, out=out)
+
+def _sexp(x, rate, out):
+    np.multiply(x, -rate, out=out)
+    np.exp(out, out=out)
+    out[x < 0] = 1
+
+def _logpexp(x, rate, out):
+    np.multiply(x, rate, out=out)
+    _log1mexp(out)
+    out[x < 0] = -np.inf
+
+def _logsexp(x, rate, out):
+    np.multiply(x, -rate, out=out)
+    out[x < 0] = 0
+
+def _sweibull(x, shape, scale, out):
+    np.divide(x, scale, out=out)
+    np.power(out, shape, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    out[x < 0] = 1
+
+def _logpweibull(x, shape, scale, out):
+    np.divide(x, scale, out=out)
+    np.power(out, shape, out=out)
+    _log1mexp(out)
+    out[x < 0] = -np.inf
+
+def _logsweibull(x, shape, scale, out):
+    np.divide(x, scale, out=out)
+    np.power(out, shape, out=out)
+    np.negative(out, out=out)
+    out[x < 0] = 0
+
+def _sgamma(x, shape, rate, out):
+    np.multiply(x, rate, out=out)
+    special.gammaincc(shape, out, out=out)
+    out[x < 0] = 1
+
+def _sunif(x, min, max, out):
+    np.subtract(max, x, out=out)
+    out /= max - min
+    np.clip(out, 0, 1, out=out)
+
+def _logpunif(x, min, max, out):
+    _punif(x, min, max, out)
+    np.log(out, out=out)
+
+def _logsunif(x, min, max, out):
+    lower = np.empty_like(out)
+    _punif(x, min, max, lower)
+    _sunif(x, min, max, out)
+    # Near min the upper tail is close to 1, where log1p(-p) keeps the digits log(1 - p) would lose
+    near = out > 0.5
+    out[~near] = np.log(out[~near])
+    out[near] = np.log1p(-lower[near])
+
+_KERNELS = {
+    'dnorm': _dnorm, 'pnorm': _pnorm, 'qnorm': _qnorm,
+    'dexp': _dexp, 'pexp': _pexp, 'qexp': _qexp,
+    'dweibull': _dweibull, 'pweibull': _pweibull, 'qweibull': _qweibull,
+    'dunif': _dunif, 'punif': _punif, 'qunif': _qunif,
+    'snorm': _snorm, 'logpnorm': _logpnorm, 'logsnorm': _logsnorm,
+    'sexp': _sexp, 'logpexp': _logpexp, 'logsexp': _logsexp,
+    'sweibull': _sweibull, 'logpweibull': _logpweibull, 'logsweibull': _logsweibull,
+    'sgamma': _sgamma,
+    'sunif': _sunif, 'logpunif': _logpunif, 'logsunif': _logsunif,
+}
+
+# The kernels only cover finite parameters inside each family's valid range;
+# anything else (e.g. sd = 0) goes to scipy, which knows how to return nan for it.
+_VALID = {
+    'norm': lambda mean, sd: sd > 0,
+    'exp': lambda rate: rate > 0,
+    'weibull': lambda shape, scale: (shape > 0) & (scale > 0),
+    'unif': lambda min, max: max > min,
+    'gamma': lambda shape, rate: (shape > 0) & (rate > 0),
+    'pois': lambda mu: mu > 0,
+    'binom': lambda size, prob: (size >= 0) & (size == np.floor(size)) & (prob >= 0) & (prob <= 1),
+}
+
+# Which scipy method each R-style prefix calls
+# ("s" is the upper tail, 1 - p, and a "log" prefix means the log of it)
+_METHODS = {'d': 'pdf', 'p': 'cdf', 'q': 'ppf', 's': 'sf',
+            'logd': 'logpdf', 'logp': 'logcdf', 'logs': 'logsf'}
+
+def set_backend(backend='fast'):
+    """
+    Choose how the d/p/q functions are computed, for the whole module.
+
+    Parameters:
+    -----------
+    backend : str, optional, default='fast'
+        Either "fast" (closed-form numpy kernels where we have them, scipy otherwise)
+        or "scipy" (always scipy.stats).
+
+    Returns:
+    --------
+    str
+        The previous backend, so you can switch back when you're done.
+    """
+    if backend not in ('fast', 'scipy'):
+        raise ValueError("`backend` must be one of fast, scipy.")
+    previous = _options['backend']
+    _options['backend'] = backend
+    return previous
+
+def _covered(family, params):
+    """
+    Check whether the fast kernels can handle `params` for `family`.
+    Returns the parameters (scalars as floats, anything else as float arrays) if so,
+    or None if scipy should handle them.
+    """
+    # Plain numbers are the common case, and much cheaper to check than arrays
+    if all(isinstance(param, (int, float, np.number)) for param in params):
+        params = [float(param) for param in params]
+        if all(map(isfinite, params)) and _VALID[family](*params):
+            return params
+        return None
+    try:
+        params = [np.asarray(param, dtype=float) for param in params]
+    except (TypeError, ValueError):
+        return None
+    if all(np.isfinite(param).all() for param in params) and np.all(_VALID[family](*params)):
+        return params
+    return None
+
+def _kernel(kind, family, covered):
+    """
+    Get the fast kernel for `kind` (e.g. "d") of `family` (e.g. "norm"),
+    or None if there isn't one that takes the `covered` parameters (see `_covered`).
+    """
+    if covered is None or _options['backend'] != 'fast':
+        return None
+    name = kind + family
+    kernel = _KERNELS.get(name)
+    if kernel is None and _options['quantiles'] == 'table':
+        kernel = _TABLES.get(name)
+    # Tables are built per parameter set, so they only take one set at a time
+    if kernel is not None and family in _TABULATED and any(np.ndim(param) for param in covered):
+        return None
+    return kernel
+
+def _apply(kernel, x, params, out=None):
+    """
+    Run `kernel` at x for the covered `params`, writing straight into `out`
+    when `out` is a float array of the right shape.
+    """
+    x = np.asarray(x, dtype=float)
+    arrays = [param.shape for param in params if isinstance(param, np.ndarray)]
+    shape = np.broadcast_shapes(x.shape, *arrays) if arrays else x.shape
+    if out is not None and out.shape == shape and out.dtype == np.float64:
+        buffer = out
+    else:
+        buffer = np.empty(shape)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        kernel(np.broadcast_to(x, shape), *params, buffer)
+    return buffer if buffer.ndim else buffer[()]
+
+def _scipy(kind, family, params, x):
+    """
+    Evaluate `kind` (a key of _METHODS, e.g. "d" or "logs") at x with the cached frozen scipy distribution.
+    """
+    dist = _dist(family, *params)
+    method = _METHODS[kind]
+    if isinstance(dist.dist, stats.rv_discrete):
+        method = method.replace('pdf', 'pmf')
+    return getattr(dist, method)(x)
+
+def _evaluate(name, x, params, out=None):
+    """
+    Evaluate the d/p/q function `name` (e.g. "dnorm") at x for a tuple of R-style `params`.
+
+    Uses the fast kernel when there is one and it covers `params`,
+    writing straight into `out` when `out` is a float array of the right shape.
+    Otherwise falls back to the cached frozen scipy distribution.
+    """
+    kind, family = name[0], name[1:]
+    covered = None
+    if _options['backend'] == 'fast' and (name in _KERNELS or name in _TABLES):
+        covered = _covered(family, params)
+    kernel = _kernel(kind, family, covered)
+    if kernel is not None:
+        return _apply(kernel, x, covered, out)
+    return _scipy(kind, family, params, x)
+
+# Quantile Tables ##################################
+
+# qgamma calls scipy's ppf, which has to solve for each quantile iteratively.
+# In "table" mode, each shape instead gets an interpolation table built once, cached,
+# and reused for every later lookup. (qweibull needs no table; its kernel is already closed-form.)
+
+_options['quantiles'] = 'exact'
+_options['tolerance'] = 1e-10
+
+# Gamma tables cover probabilities whose log-odds fall in this range (about 1e-13 to 1 - 1e-13).
+# More extreme probabilities still go to scipy.
+_LOGIT_RANGE = (-30.0, 30.0)
+
+# The most nodes a gamma table can have before we give up on it
+_MAX_NODES = 2**14
+
+def set_quantiles(method='exact', tolerance=1e-10):
+    """
+    Choose how qgamma computes quantiles, for the whole module.
+
+    Parameters:
+    -----------
+    method : str, optional, default='exact'
+        Either "exact" (scipy's ppf every time) or "table" (look quantiles up in a table
+        built once per parameter set and cached).
+    tolerance : float, optional, default=1e-10
+        In "table" mode, the largest relative error allowed in a quantile. It can't go below 1e-12,
+        about as fine as floating point rounding in the table's own nodes allows.
+
+    Returns:
+    --------
+    str
+        The previous method, so you can switch back when you're done.
+
+    Notes:
+    ------
+    Tables pay off when you look up many quantiles for the same parameters,
+    e.g. inverse-transform sampling with qgamma(runif(10**6), shape=2.5).
+    qpois and qbinom use (exact) tables once a parameter set is looked up often enough; see `_discrete_table`.
+    """
+    if method not in ('exact', 'table'):
+        raise ValueError("`method` must be one of exact, table.")
+    if not 1e-12 <= tolerance < 1:
+        raise ValueError("`tolerance` must be between 1e-12 and 1.")
+    previous = _options['quantiles']
+    _options['quantiles'] = method
+    _options['tolerance'] = tolerance
+    return previous
+
+def _logit(p):
+    return np.log(p) - np.log1p(-p)
+
+def _gamma_nodes(p, shape):
+    """
+    Table nodes for a rate-1 gamma distribution at probabilities p: the log-odds u of p,
+    the log-quantile v, and the slope dv/du = p (1 - p) / (x f(x)), from the exact quantile x.
+    """
+    x = stats.gamma.ppf(p, shape)
+    slope = np.exp(np.log(p) + np.log1p(-p) - np.log(x) - stats.gamma.logpdf(x, shape))
+    return _logit(p), np.log(x), slope
+
+def _hermite(t, u, v, slope):
+    """
+    Cubic Hermite interpolation of the nodes (u, v, slope) at points t.
+    """
+    i = np.clip(np.searchsorted(u, t) - 1, 0, len(u) - 2)
+    h = u[i + 1] - u[i]
+    s = (t - u[i]) / h
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * v[i] + (s3 - 2 * s2 + s) * h * slope[i]
+            + (3 * s2 - 2 * s3) * v[i + 1] + (s3 - s2) * h * slope[i + 1])
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _gamma_table(shape, tolerance):
+    """
+    Tabulate the log-quantiles of a rate-1 gamma distribution against the log-odds of p.
+
+    In those coordinates the quantile function is smooth and close to linear in both tails,
+    so cubic Hermite interpolation (with exact slopes) converges quickly. Starting from an even grid,
+    any interval whose interpolated midpoint misses the exact quantile by more than
+    tolerance / 4 (relative) gets split, until every interval passes.
+    Nodes sit at the log-odds of the floating point p itself, which is what lookups compute.
+
+    For small shapes, the lowest quantiles underflow to 0, where the log-quantile is -inf;
+    the table starts at the first node above that, and anything lower goes to scipy.
+    Returns None (so lookups go to scipy) if fewer than 2 nodes are left, or if the table
+    would need more than _MAX_NODES nodes: near the tolerance floor, rounding error in the nodes
+    themselves can keep intervals from ever passing.
+    """
+    p = special.expit(np.linspace(*_LOGIT_RANGE, 65))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u, v, slope = _gamma_nodes(p, shape)
+        valid = np.isfinite(v) & np.isfinite(slope)
+        # The quantile only grows with p, so everything from the first valid node on is valid
+        if valid.sum() < 2:
+            return None
+        p = p[np.argmax(valid):]
+        while True:
+            u, v, slope = _gamma_nodes(p, shape)
+            mid = special.expit((u[:-1] + u[1:]) / 2)
+            u_mid, v_mid, _ = _gamma_nodes(mid, shape)
+            # A non-finite error (e.g. from an underflowed midpoint) counts as a miss
+            bad = ~(np.abs(np.expm1(_hermite(u_mid, u, v, slope) - v_mid)) <= tolerance / 4)
+            if not bad.any():
+                return u, v, slope
+            p = np.unique(np.concatenate([p, mid[bad]]))
+            if len(p) > _MAX_NODES:
+                return None
+
+def _qgamma(x, shape, rate, out):
+    table = _gamma_table(shape, _options['tolerance'])
+    if table is None:
+        out[...] = stats.gamma.ppf(x, shape, scale=1 / rate)
+        return
+    u, v, slope = table
+    logit = _logit(x)
+    inside = (logit >= u[0]) & (logit <= u[-1])
+    out[...] = 0
+    out[inside] = np.exp(_hermite(logit[inside], u, v, slope)) / rate
+    if not inside.all():
+        out[~inside] = stats.gamma.ppf(x[~inside], shape, scale=1 / rate)
+
+_TABLES = {'qgamma': _qgamma}
+
+# Discrete Tables ##################################
+
+# Poisson and binomial d/p/q functions look their answers up in a table of the PMF and CDF
+# over the support, built with scipy's own pmf and cdf (so lookups agree with scipy exactly):
+# dpois/dbinom and ppois/pbinom become array gathers, and qpois/qbinom a binary search of the CDF.
+# A table costs about as much to build as evaluating scipy's pmf twice over the support, plus a fixed
+# overhead, so a parameter set only gets one once its lookups (in one big call, or over several)
+# would have cost scipy at least that much. Until then, lookups go straight to scipy.
+
+# The most memory (in bytes), and the most tables, kept at once;
+# the least recently used tables are dropped to stay under both.
+TABLE_BYTES = 2**27
+TABLE_COUNT = CACHE_SIZE
+
+# The largest discrete support we'll tabulate
+_MAX_SUPPORT = 10**6
+
+# The fixed cost of building a table, and of one scipy ppf evaluation, both counted in scipy pmf evaluations
+_BUILD_COST = 10**4
+_PPF_COST = 32
+
+# Discrete quantiles for p this close to 0 or 1 still go to scipy: out in the tails
+# its ppf loses accuracy and stops agreeing with a plain search of its own CDF.
+_TAIL = 1e-12
+
+# Families whose fast kernels use per-parameter tables
+_TABULATED = ('gamma', 'pois', 'binom')
+
+_discrete_tables = OrderedDict()
+# Lookup costs so far (in pmf evaluations), for recent parameter sets without a table yet
+_discrete_demand = OrderedDict()
+_discrete_bytes = [0]
+
+def _support(family, params):
+    """
+    About how many points a table for these parameters would hold. (For the Poisson, a bound
+    a little past its 1 - _TAIL quantile, so deciding whether to build one costs nothing.)
+    """
+    if family == 'pois':
+        return params[0] + 8 * np.sqrt(params[0]) + 20
+    return params[0] + 1
+
+def _direct(family, method, x, params):
+    """
+    Call scipy's unfrozen distribution directly, which is cheaper than freezing one for a single call.
+    """
+    dist, translate = _FAMILIES[family]
+    return getattr(dist, method)(x, **translate(*params))
+
+def _discrete_table(family, params, cost):
+    """
+    Get the (pmf, cdf) table of a Poisson or binomial distribution over its support
+    (for the Poisson, as far as the 1 - _TAIL quantile), for a lookup that would cost scipy
+    `cost` pmf evaluations. Returns None (use scipy) if the support is too long,
+    or these parameters' lookups haven't added up to enough to pay for a table yet. Tables are cached, least recently used first out
+    once there are more than TABLE_COUNT of them or they pass TABLE_BYTES.
+    """
+    key = (family, params)
+    table = _discrete_tables.get(key)
+    if table is not None:
+        _discrete_tables.move_to_end(key)
+        return table
+    support = _support(family, params)
+    if not support < _MAX_SUPPORT:
+        return None
+    demand = _discrete_demand.pop(key, 0) + cost
+    if demand < 2 * support + _BUILD_COST:
+        _discrete_demand[key] = demand
+        if len(_discrete_demand) > TABLE_COUNT:
+            _discrete_demand.popitem(last=False)
+        return None
+    if family == 'pois':
+        top = stats.poisson.ppf(1 - _TAIL, params[0])
+    else:
+        top = params[0]
+    dist = _dist(family, *params)
+    support = np.arange(int(top) + 1)
+    table = (dist.pmf(support), dist.cdf(support))
+    _discrete_tables[key] = table
+    _discrete_bytes[0] += table[0].nbytes + table[1].nbytes
+    while len(_discrete_tables) > 1 and (len(_discrete_tables) > TABLE_COUNT or _discrete_bytes[0] > TABLE_BYTES):
+        _, old = _discrete_tables.popitem(last=False)
+        _discrete_bytes[0] -= old[0].nbytes + old[1].nbytes
+    return table
+
+def _ddiscrete(family, x, params, out):
+    table = _discrete_table(family, params, x.size)
+    if table is None:
+        out[...] = _direct(family, 'pmf', x, params)
+        return
+    pmf = table[0]
+    inside = (x >= 0) & (x < len(pmf)) & (x == np.floor(x))
+    out[inside] = pmf[x[inside].astype(np.intp)]
+    if not inside.all():
+        out[~inside] = _direct(family, 'pmf', x[~inside], params)
+
+def _pdiscrete(family, x, params, out):
+    table = _discrete_table(family, params, x.size)
+    if table is None:
+        out[...] = _direct(family, 'cdf', x, params)
+        return
+    cdf = table[1]
+    inside = (x >= 0) & (x < len(cdf))
+    out[inside] = cdf[x[inside].astype(np.intp)]
+    if not inside.all():
+        out[~inside] = _direct(family, 'cdf', x[~inside], params)
+
+def _qdiscrete(family, x, params, out):
+    table = _discrete_table(family, params, _PPF_COST * x.size)
+    if table is None:
+        out[...] = _direct(family, 'ppf', x, params)
+        return
+    cdf = table[1]
+    # The quantile is the smallest k whose CDF reaches x
+    out[...] = np.searchsorted(cdf, x, side='left')
+    outside = ~((x > _TAIL) & (x < 1 - _TAIL)) | (out >= len(cdf))
+    if outside.any():
+        out[outside] = _direct(family, 'ppf', x[outside], params)
+
+_KERNELS.update({
+    'dpois': lambda x, mu, out: _ddiscrete('pois', x, (mu,), out),
+    'ppois': lambda x, mu, out: _pdiscrete('pois', x, (mu,), out),
+    'qpois': lambda x, mu, out: _qdiscrete('pois', x, (mu,), out),
+    'dbinom': lambda x, size, prob, out: _ddiscrete('binom', x, (size, prob), out),
+    'pbinom': lambda x, size, prob, out: _pdiscrete('binom', x, (size, prob), out),
+    'qbinom': lambda x, size, prob, out: _qdiscrete('binom', x, (size, prob), out),
+})
+
+# Random Number Generation #########################
+
+# The r* functions draw from numpy Generators rather than scipy's global RandomState,
+# so runs can be seeded, and parallel workers can each get their own independent stream.
+_SAMPLERS = {
+    'norm': lambda rng, n, mean, sd: rng.normal(mean, sd, n),
+    'exp': lambda rng, n, rate: rng.exponential(1 / rate, n),
+    'weibull': lambda rng, n, shape, scale: scale * rng.weibull(shape, n),
+    'gamma': lambda rng, n, shape, rate: rng.gamma(shape, 1 / rate, n),
+    'pois': lambda rng, n, mu: rng.poisson(mu, n),
+    'binom': lambda rng, n, size, prob: rng.binomial(size, prob, n),
+    'unif': lambda rng, n, min, max: rng.uniform(min, max, n),
+}
+
+# Counts come back as integers; everything else as floats
+_DTYPES = {'pois': np.int64, 'binom': np.int64}
+
+# Draws per random stream. This is fixed (not tied to the number of workers),
+# which is what makes draws identical with or without workers, and no matter how many share them.
+# It also bounds the memory parallel draws need beyond the result: a couple of chunks per worker.
+RNG_CHUNK = 2**22
+
+_options['rng'] = np.random.default_rng()
+
+def set_seed(seed=None):
+    """
+    Seed the module-wide random number generator, like R's set.seed().
+
+    Parameters:
+    -----------
+    seed : int or numpy.random.SeedSequence, optional, default=None
+        The seed. Leave it as None to reseed from fresh operating system entropy.
+
+    Returns:
+    --------
+    numpy.random.Generator
+        The new module-wide generator.
+
+    Examples:
+    ---------
+    set_seed(12345)
+    rnorm(3)   # the same 3 values every time
+    """
+    _options['rng'] = np.random.default_rng(seed)
+    return _options['rng']
+
+def spawn(n, rng=None):
+    """
+    Make `n` independent random number generators, branched off from one parent
+    with numpy's SeedSequence. Give one to each worker process to avoid duplicated streams.
+
+    Parameters:
+    -----------
+    n : int
+        The number of child generators to make.
+    rng : numpy.random.Generator, optional, default=None
+        The parent generator. Defaults to the module-wide generator (see `set_seed`).
+
+    Returns:
+    --------
+    list of numpy.random.Generator
+        The child generators. Repeated calls give new, different children.
+    """
+    rng = _options['rng'] if rng is None else rng
+    return rng.spawn(n)
+
+def _chunk(params, start, stop):
+    """
+    The parameters for draws start to stop: per-draw (array) parameters get sliced to match.
+    """
+    return [param[start:stop] if np.ndim(param) else param for param in params]
+
+def _fill(family, count, params, rng):
+    """
+    Worker task for parallel draws: draw one chunk of `count` values from `rng`.
+    """
+    return _SAMPLERS[family](rng, count, *params)
+
+def _draw(family, n, params, rng=None, workers=None, out=None):
+    """
+    Draw `n` values from `family` with R-style `params`.
+
+    The draws are split into RNG_CHUNK-sized chunks: the first comes straight from `rng`
+    (or the module-wide generator), and each later one from its own child stream spawned from `rng`.
+    With `workers`, the later chunks are drawn by `workers` processes and sent back as they finish,
+    a few per worker at a time, so the output array is the only full-size allocation.
+    Either way, the result depends only on `rng`'s state, never on the number of workers.
+    If `out` is a 1-D array of n values, the draws are written straight into it.
+    """
+    rng = _options['rng'] if rng is None else rng
+    if workers is not None and workers < 1:
+        raise ValueError("`workers` must be at least 1.")
+    sampler = _SAMPLERS[family]
+    if n <= RNG_CHUNK:
+        return sampler(rng, n, *params)
+    starts = range(0, n, RNG_CHUNK)
+    streams = [rng] + rng.spawn(len(starts) - 1)
+    dtype = np.dtype(_DTYPES.get(family, np.float64))
+    output = out if isinstance(out, np.ndarray) and out.shape == (n,) else np.empty(n, dtype=dtype)
+    if workers is None or workers == 1:
+        for start, stream in zip(starts, streams):
+            stop = min(start + RNG_CHUNK, n)
+            output[start:stop] = sampler(stream, stop - start, *_chunk(params, start, stop))
+        return output
+    jobs = zip(starts[1:], streams[1:])
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit():
+            for start, stream in islice(jobs, 1):
+                stop = min(start + RNG_CHUNK, n)
+                pending.append((start, stop, pool.submit(_fill, family, stop - start,
+                                                         _chunk(params, start, stop), stream)))
+        # Keep two chunks per worker in flight, so finished chunks never pile up in memory
+        for _ in range(2 * workers):
+            submit()
+        # Draw the first chunk here, from `rng` itself, while the workers draw the rest
+        output[:RNG_CHUNK] = sampler(rng, RNG_CHUNK, *_chunk(params, 0, RNG_CHUNK))
+        while pending:
+            start, stop, task = pending.popleft()
+            output[start:stop] = task.result()
+            submit()
+    return output
+
+# Distribution Objects #############################
+
+# Each distribution family is also a small class: build it once with its parameters,
+# and it checks them and works out the constants its formulas need (like log(gamma(shape)))
+# just once, instead of on every call. The d/p/q/r functions below are thin wrappers around these.
+
+class Distribution:
+    """
+    A probability distribution with fixed parameters, like a frozen scipy distribution.
+    Use one of the families below (e.g. `Normal(mean=0, sd=1)`), not this base class.
+
+    Methods:
+    --------
+    d(x), p(x), q(x) : the density (or mass), cumulative probability, and quantile functions.
+        As in R, d takes `log=True` for the log density, and p takes `lower_tail=False`
+        for the upper tail probability and `log_p=True` for its log.
+    r(n) : n random draws.
+    logd(x) : the log density (or log mass), accurate even where d(x) underflows to 0.
+    loglik(x) : the log-likelihood of data x, i.e. the sum of logd(x).
+
+    Like the functions, d/p/q/logd take an `out` array to write into, and r takes `out`, `rng` and `workers`.
+    """
+    __slots__ = ('params', '_fast')
+    # The family's name in the module's tables, and its parameters' names, in order
+    family = None
+    names = ()
+
+    def __init__(self, *params):
+        self.params = params
+        # The parameters as the fast kernels take them, or None if only scipy can handle them
+        self._fast = _covered(self.family, params)
+        if self._fast is not None:
+            self._cache(*self._fast)
+
+    def _cache(self, *params):
+        """
+        Work out and store the constants this family's formulas reuse.
+        """
+
+    def __getattr__(self, name):
+        # Parameters by name, e.g. Normal(0, 2).sd
+        # (Look the name up before touching self.params, which doesn't exist yet while unpickling)
+        if name not in type(self).names:
+            raise AttributeError(name)
+        return self.params[type(self).names.index(name)]
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + ", ".join(f"{name}={param!r}" for name, param in zip(self.names, self.params)) + ")"
+
+    def _evaluate(self, kind, x, out=None, kernel=None):
+        """
+        Evaluate `kind` (a key of _METHODS, e.g. "d" or "logs") at x, with `kernel` (or the module's fast kernel)
+        if our parameters are covered, and with scipy otherwise.
+        """
+        if self._fast is not None and _options['backend'] == 'fast':
+            if kernel is None:
+                kernel = _kernel(kind, self.family, self._fast)
+            if kernel is not None:
+                return _apply(kernel, x, self._fast, out)
+        return _scipy(kind, self.family, self.params, x)
+
+    def d(self, x, out=None, log=False):
+        if log:
+            return self.logd(x, out)
+        return _output(self._evaluate('d', x, out), out)
+
+    def p(self, x, out=None, lower_tail=True, log_p=False):
+        kind = ('log' if log_p else '') + ('p' if lower_tail else 's')
+        return _output(self._evaluate(kind, x, out), out)
+
+    def q(self, x, out=None):
+        return _output(self._evaluate('q', x, out), out)
+
+    def r(self, n, out=None, rng=None, workers=None):
+        return _output(_draw(self.family, n, self.params, rng, workers, out), out)
+
+    def logd(self, x, out=None):
+        return _output(self._evaluate('logd', x, out, self._logd), out)
+
+    def loglik(self, x):
+        return float(np.sum(self._evaluate('logd', x, None, self._logd)))
+
+class Normal(Distribution):
+    """
+    The normal distribution with mean `mean` and standard deviation `sd`.
+    """
+    __slots__ = ('_lognorm',)
+    family = 'norm'
+    names = ('mean', 'sd')
+
+    def __init__(self, mean=0, sd=1):
+        super().__init__(mean, sd)
+
+    def _cache(self, mean, sd):
+        self._lognorm = np.log(sd * _SQRT_2PI)
+
+    def _logd(self, x, mean, sd, out):
+        np.subtract(x, mean, out=out)
+        out /= sd
+        np.square(out, out=out)
+        out *= -0.5
+        out -= self._lognorm
+
+class Exponential(Distribution):
+    """
+    The exponential distribution with rate `rate` (the scale is 1 / rate).
+    """
+    __slots__ = ('_lograte',)
+    family = 'exp'
+    names = ('rate',)
+
+    def __init__(self, rate=0.01):
+        super().__init__(rate)
+
+    def _cache(self, rate):
+        self._lograte = np.log(rate)
+
+    def _logd(self, x, rate, out):
+        np.multiply(x, -rate, out=out)
+        out += self._lograte
+        out[x < 0] = -np.inf
+
+class Weibull(Distribution):
+    """
+    The Weibull distribution with shape `shape` and scale `scale`.
+    """
+    __slots__ = ('_lognorm',)
+    family = 'weibull'
+    names = ('shape', 'scale')
+
+    def __init__(self, shape=2, scale=1):
+        super().__init__(shape, scale)
+
+    def _cache(self, shape, scale):
+        self._lognorm = np.log(shape / scale)
+
+    def _logd(self, x, shape, scale, out):
+        z = np.divide(x, scale)
+        special.xlogy(shape - 1, z, out=out)
+        out -= np.power(z, shape)
+        out += self._lognorm
+        out[x < 0] = -np.inf
+
+class Gamma(Distribution):
+    """
+    The gamma distribution with shape `shape` and rate `rate` (the scale is 1 / rate).
+    """
+    __slots__ = ('_lognorm',)
+    family = 'gamma'
+    names = ('shape', 'rate')
+
+    def __init__(self, shape=2, rate=1):
+        super().__init__(shape, rate)
+
+    def _cache(self, shape, rate):
+        # log(rate^shape / gamma(shape)), the log of the density's normalizing constant
+        self._lognorm = shape * np.log(rate) - special.gammaln(shape)
+
+    def _logd(self, x, shape, rate, out):
+        special.xlogy(shape - 1, x, out=out)
+        out -= np.multiply(x, rate)
+        out += self._lognorm
+        out[x < 0] = -np.inf
+
+    def _d(self, x, shape, rate, out):
+        self._logd(x, shape, rate, out)
+        np.exp(out, out=out)
+
+    def d(self, x, out=None, log=False):
+        if log:
+            return self.logd(x, out)
+        return _output(self._evaluate('d', x, out, self._d), out)
+
+class Poisson(Distribution):
+    """
+    The Poisson distribution with mean `mu`.
+    """
+    __slots__ = ('_logmu',)
+    family = 'pois'
+    names = ('mu',)
+
+    def __init__(self, mu=1):
+        super().__init__(mu)
+
+    def _cache(self, mu):
+        self._logmu = np.log(mu)
+
+    def _logd(self, x, mu, out):
+        np.multiply(x, self._logmu, out=out)
+        out -= mu
+        out -= special.gammaln(x + 1)
+        out[(x < 0) | (x != np.floor(x))] = -np.inf
+        out[np.isnan(x)] = np.nan
+
+class Binomial(Distribution):
+    """
+    The binomial distribution: the number of successes in `size` trials, each with probability `prob`.
+    """
+    __slots__ = ('_lognorm',)
+    family = 'binom'
+    names = ('size', 'prob')
+
+    def __init__(self, size=1, prob=0.5):
+        super().__init__(size, prob)
+
+    def _cache(self, size, prob):
+        self._lognorm = special.gammaln(size + 1)
+
+    def _logd(self, x, size, prob, out):
+        # log(size choose x) + x log(prob) + (size - x) log(1 - prob)
+        special.xlogy(x, prob, out=out)
+        out += special.xlog1py(size - x, -prob)
+        out -= special.gammaln(x + 1)
+        out -= special.gammaln(size - x + 1)
+        out += self._lognorm
+        out[(x < 0) | (x > size) | (x != np.floor(x))] = -np.inf
+        out[np.isnan(x)] = np.nan
+
+class Uniform(Distribution):
+    """
+    The uniform distribution between `min` and `max`.
+    """
+    __slots__ = ('_logdensity',)
+    family = 'unif'
+    names = ('min', 'max')
+
+    def __init__(self, min=0, max=1):
+        super().__init__(min, max)
+
+    def _cache(self, min, max):
+        self._logdensity = -np.log(max - min)
+
+    def _logd(self, x, min, max, out):
+        out[...] = self._logdensity
+        out[(x < min) | (x > max)] = -np.inf
+        out[np.isnan(x)] = np.nan
+
+# Each family's class, by its name in the module's tables
+_CLASSES = {cls.family: cls for cls in (Normal, Exponential, Weibull, Gamma, Poisson, Binomial, Uniform)}
+
+# Log-Likelihood ###################################
+
+# Log-likelihoods (with gradients and Hessians) for fitting distributions by maximum likelihood.
+# Each family first boils the data down to its sufficient statistics (n, sum x, sum log x, ...),
+# in one pass. After that, each evaluation, as in each step of an optimizer, costs next to nothing.
+# (The Weibull has no fixed-size sufficient statistics, so it keeps log x and makes one fused pass per evaluation.)
+# The gradient and Hessian are with respect to the R-style parameters, in order;
+# for the binomial, `size` is taken as known, so they cover `prob` only.
+
+def _sufficient_norm(x):
+    mean = x.mean() if len(x) else 0.0
+    return {'mean': mean, 'm2': np.square(x - mean).sum(), 'outside': 0}
+
+def _sufficient_exp(x):
+    return {'sum': x.sum(), 'outside': np.count_nonzero(x < 0)}
+
+def _sufficient_gamma(x):
+    positive = x > 0
+    return {'sum': x.sum(), 'sumlog': np.log(x[positive]).sum(), 'outside': len(x) - np.count_nonzero(positive)}
+
+def _sufficient_weibull(x):
+    positive = x > 0
+    return {'log': np.log(x[positive]), 'outside': len(x) - np.count_nonzero(positive)}
+
+def _sufficient_pois(x):
+    counts = (x >= 0) & (x == np.floor(x))
+    return {'sum': x.sum(), 'lfactorial': special.gammaln(x[counts] + 1).sum(), 'outside': len(x) - np.count_nonzero(counts)}
+
+def _sufficient_binom(x):
+    counts = (x >= 0) & (x == np.floor(x))
+    # How many times each count 0, 1, 2, ... appears, so the log(size choose x) terms
+    # can be summed for any size without going back to the data
+    tally = np.bincount(x[counts].astype(np.intp)) if counts.any() else np.zeros(1, dtype=np.intp)
+    return {'sum': x.sum(), 'tally': tally, 'outside': len(x) - np.count_nonzero(counts)}
+
+_SUFFICIENT = {
+    'norm': _sufficient_norm, 'exp': _sufficient_exp, 'gamma': _sufficient_gamma,
+    'weibull': _sufficient_weibull, 'pois': _sufficient_pois, 'binom': _sufficient_binom,
+}
+
+def _loglik_norm(n, stats, mean, sd):
+    diff = stats['mean'] - mean
+    ss = stats['m2'] + n * diff * diff
+    value = -n * np.log(sd * _SQRT_2PI) - ss / (2 * sd * sd)
+    gradient = np.array([n * diff / sd**2, -n / sd + ss / sd**3])
+    hessian = np.array([[-n / sd**2, -2 * n * diff / sd**3],
+                        [-2 * n * diff / sd**3, n / sd**2 - 3 * ss / sd**4]])
+    return value, gradient, hessian
+
+def _loglik_exp(n, stats, rate):
+    value = n * np.log(rate) - rate * stats['sum']
+    return value, np.array([n / rate - stats['sum']]), np.array([[-n / rate**2]])
+
+def _loglik_gamma(n, stats, shape, rate):
+    value = (n * (shape * np.log(rate) - special.gammaln(shape))
+             + (shape - 1) * stats['sumlog'] - rate * stats['sum'])
+    gradient = np.array([n * (np.log(rate) - special.digamma(shape)) + stats['sumlog'],
+                         n * shape / rate - stats['sum']])
+    hessian = np.array([[-n * special.polygamma(1, shape), n / rate],
+                        [n / rate, -n * shape / rate**2]])
+    return value, gradient, hessian
+
+def _loglik_weibull(n, stats, shape, scale):
+    # With z = x / scale and w = z^shape: one pass for the sums of w, w log z, and w log(z)^2
+    logz = stats['log'] - np.log(scale)
+    w = np.exp(shape * logz)
+    sumlogz, sumw = logz.sum(), w.sum()
+    w *= logz
+    sumwlogz = w.sum()
+    w *= logz
+    sumwlogz2 = w.sum()
+    value = n * np.log(shape / scale) + (shape - 1) * sumlogz - sumw
+    gradient = np.array([n / shape + sumlogz - sumwlogz,
+                         shape / scale * (sumw - n)])
+    cross = (sumw - n + shape * sumwlogz) / scale
+    hessian = np.array([[-n / shape**2 - sumwlogz2, cross],
+                        [cross, -shape / scale**2 * ((shape + 1) * sumw - n)]])
+    return value, gradient, hessian
+
+def _loglik_pois(n, stats, mu):
+    value = special.xlogy(stats['sum'], mu) - n * mu - stats['lfactorial']
+    return value, np.array([stats['sum'] / mu - n]), np.array([[-stats['sum'] / mu**2]])
+
+def _loglik_binom(n, stats, size, prob):
+    tally = stats['tally']
+    if len(tally) - 1 > size:
+        return -np.inf, np.full(1, np.nan), np.full((1, 1), np.nan)
+    k = np.arange(len(tally))
+    # sum of log(size choose x), from the tally of each count
+    lchoose = n * special.gammaln(size + 1) - tally @ (special.gammaln(k + 1) + special.gammaln(size - k + 1))
+    successes, failures = stats['sum'], n * size - stats['sum']
+    value = lchoose + special.xlogy(successes, prob) + special.xlog1py(failures, -prob)
+    gradient = np.array([successes / prob - failures / (1 - prob)])
+    hessian = np.array([[-successes / prob**2 - failures / (1 - prob)**2]])
+    return value, gradient, hessian
+
+_LOGLIK = {
+    'norm': _loglik_norm, 'exp': _loglik_exp, 'gamma': _loglik_gamma,
+    'weibull': _loglik_weibull, 'pois': _loglik_pois, 'binom': _loglik_binom,
+}
+
+class Sufficient:
+    """
+    The sufficient statistics of a sample for one family, as `loglik` uses them.
+    Make one with `sufficient()`, then pass it to `loglik` in place of the data
+    to skip going back over the data on every call.
+    """
+    __slots__ = ('family', 'n', 'stats')
+
+    def __init__(self, family, n, stats):
+        self.family = family
+        self.n = n
+        self.stats = stats
+
+def sufficient(family, x):
+    """
+    Summarize data x into the sufficient statistics `loglik` needs for `family`.
+
+    Parameters:
+    -----------
+    family : str
+        One of "norm", "exp", "gamma", "weibull", "pois", or "binom".
+    x : array-like
+        The data.
+
+    Returns:
+    --------
+    Sufficient
+        The statistics, to pass to `loglik` as its `x`.
+    """
+    if family not in _SUFFICIENT:
+        raise ValueError("`family` must be one of " + ", ".join(_SUFFICIENT) + ".")
+    x = np.ravel(np.asarray(x, dtype=float))
+    output = Sufficient(family, len(x), _SUFFICIENT[family](x))
+    return output
+
+def loglik(family, params, x, hessian=False):
+    """
+    Compute the log-likelihood of data x under `family` with R-style `params`,
+    along with its gradient (and optionally its Hessian) with respect to those parameters.
+
+    Parameters:
+    -----------
+    family : str
+        One of "norm" (mean, sd), "exp" (rate), "gamma" (shape, rate), "weibull" (shape, scale),
+        "pois" (mu), or "binom" (size, prob).
+    params : sequence of float
+        The parameters, in the order above.
+    x : array-like or Sufficient
+        The data, or its sufficient statistics from `sufficient()` (much faster when calling repeatedly).
+    hessian : bool, optional, default=False
+        Whether to also return the matrix of second derivatives.
+
+    Returns:
+    --------
+    tuple
+        (log-likelihood, gradient) or, with hessian=True, (log-likelihood, gradient, Hessian).
+        The gradient and Hessian are numpy arrays over the parameters in order;
+        for "binom", `size` counts as known, so they cover `prob` only.
+        Data outside the family's support give a log-likelihood of -inf,
+        and invalid parameters give nan.
+
+    Examples:
+    ---------
+    # Fit an exponential distribution with a gradient-based optimizer
+    s = sufficient("exp", x)
+    minimize(lambda par: [-v for v in loglik("exp", par, s)], x0=[1], jac=True, bounds=[(1e-6, None)])
+    """
+    if not isinstance(x, Sufficient):
+        x = sufficient(family, x)
+    elif x.family != family:
+        raise ValueError("These sufficient statistics are for " + x.family + ", not " + family + ".")
+    params = [float(param) for param in params]
+    k = 1 if family == 'binom' else len(params)
+    if not (all(map(isfinite, params)) and _VALID[family](*params)):
+        value, gradient, hess = np.nan, np.full(k, np.nan), np.full((k, k), np.nan)
+    elif x.stats['outside']:
+        value, gradient, hess = -np.inf, np.full(k, np.nan), np.full((k, k), np.nan)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value, gradient, hess = _LOGLIK[family](x.n, x.stats, *params)
+    if hessian:
+        return float(value), gradient, hess
+    return float(value), gradient
+
+# Maximum Likelihood Fitting #######################
+
+# Fit distributions to many groups of data at once. Each group's fit only needs a few
+# per-group sums, which np.bincount adds up for every group in one pass over the data.
+# Normal, Poisson, and exponential MLEs are closed-form. The gamma and Weibull shapes
+# are solved by Newton's method, stepping every group's estimate together.
+
+def _fit_norm(x, codes, n, total, tolerance, max_iter):
+    mean = total(x) / n
+    sd = np.sqrt(total(np.square(x - mean[codes])) / n)
+    # Constant (e.g. single-value) groups have no spread to fit a normal to
+    flat = ~(sd > 0)
+    mean[flat] = np.nan
+    sd[flat] = np.nan
+    loglik = -n / 2 * (np.log(2 * np.pi * sd**2) + 1)
+    return [mean, sd], loglik
+
+def _fit_pois(x, codes, n, total, tolerance, max_iter):
+    counts = (x >= 0) & (x == np.floor(x))
+    mu = total(x) / n
+    mu[total(~counts) > 0] = np.nan
+    loglik = special.xlogy(n * mu, mu) - n * mu - total(special.gammaln(np.where(counts, x, 0) + 1))
+    return [mu], loglik
+
+def _fit_exp(x, codes, n, total, tolerance, max_iter):
+    rate = n / total(x)
+    # All-zero groups would get an infinite rate
+    rate[(total(x < 0) > 0) | ~np.isfinite(rate)] = np.nan
+    loglik = n * np.log(rate) - n
+    return [rate], loglik
+
+def _fit_gamma(x, codes, n, total, tolerance, max_iter):
+    mean = total(x) / n
+    meanlog = total(np.log(np.where(x > 0, x, 1))) / n
+    # The shape solves log(shape) - digamma(shape) = s, where s = log(mean) - mean(log x) > 0
+    s = np.log(mean) - meanlog
+    s[(total(x <= 0) > 0) | ~(s > 0)] = np.nan
+    # Start from Minka's approximation, then take Newton steps on 1 / shape (Minka 2002)
+    shape = (3 - s + np.sqrt((s - 3)**2 + 24 * s)) / (12 * s)
+    for _ in range(max_iter):
+        step = (np.log(shape) - special.digamma(shape) - s) / (shape**2 * (1 / shape - special.polygamma(1, shape)))
+        shape = 1 / (1 / shape + step)
+        if not np.nanmax(np.abs(step * shape), initial=0) > tolerance:
+            break
+    rate = shape / mean
+    loglik = n * (shape * np.log(rate) - special.gammaln(shape)) + (shape - 1) * n * meanlog - rate * n * mean
+    return [shape, rate], loglik
+
+def _fit_weibull(x, codes, n, total, tolerance, max_iter):
+    bad = total(x <= 0) > 0
+    # Work with z = x / (the group's largest x), so z^shape can't overflow
+    top = np.zeros(len(n))
+    np.maximum.at(top, codes, x)
+    logz = np.log(np.where(x > 0, x, 1)) - np.log(np.where(bad, 1, top))[codes]
+    meanlogz = total(logz) / n
+    # Start from the method of moments on log x: sd(log x) = pi / (shape sqrt(6))
+    sdlog = np.sqrt(total(np.square(logz - meanlogz[codes])) / n)
+    shape = np.pi / (np.sqrt(6) * sdlog)
+    shape[bad | ~np.isfinite(shape)] = np.nan
+    # The shape solves g(shape) = 1 / shape + mean(log z) - sum(z^shape log z) / sum(z^shape) = 0
+    for _ in range(max_iter):
+        w = np.exp(shape[codes] * logz)
+        b = total(w)
+        w *= logz
+        a = total(w)
+        w *= logz
+        c = total(w)
+        g = 1 / shape + meanlogz - a / b
+        slope = -1 / shape**2 - (c * b - a * a) / b**2
+        new = shape - g / slope
+        # g only falls as shape grows, but a step from far away can overshoot below 0
+        new = np.where(new > 0, new, shape / 2)
+        done = not np.nanmax(np.abs(new / shape - 1), initial=0) > tolerance
+        shape = new
+        if done:
+            break
+    b = total(np.exp(shape[codes] * logz))
+    scale = top * (b / n)**(1 / shape)
+    # At the MLE, sum((x / scale)^shape) = n
+    loglik = n * np.log(shape / scale) + (shape - 1) * (n * meanlogz + n * np.log(top / scale)) - n
+    return [shape, scale], loglik
+
+_FITTERS = {
+    'norm': _fit_norm, 'pois': _fit_pois, 'exp': _fit_exp,
+    'gamma': _fit_gamma, 'weibull': _fit_weibull,
+}
+
+def fitdistr(x, families=('norm', 'pois', 'exp', 'gamma', 'weibull'), group=None, tolerance=1e-10, max_iter=100):
+    """
+    Fit distributions to data by maximum likelihood, like R's MASS::fitdistr(),
+    for several families and many groups at once.
+
+    Parameters:
+    -----------
+    x : array-like
+        The data.
+    families : sequence of str, optional, default=('norm', 'pois', 'exp', 'gamma', 'weibull')
+        The families to fit: any of "norm", "pois", "exp", "gamma", and "weibull".
+    group : array-like, optional, default=None
+        A group label for each value of x (e.g. a column of route IDs), to fit each group separately.
+    tolerance : float, optional, default=1e-10
+        For the gamma and Weibull shapes, stop once no group's estimate changes by more than this (relative).
+    max_iter : int, optional, default=100
+        The most Newton steps to take for the gamma and Weibull shapes.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        A tidy table with one row per group, family, and parameter: the 'group' (if given), 'family',
+        'parameter' (its R-style name, like 'mean' or 'rate'), 'estimate', the sample size 'n',
+        and the fit's maximized log-likelihood 'loglik'. Estimates are nan where a family can't fit
+        a group's data (e.g. a gamma for data with zeros or negatives, or a normal for a group with no spread).
+
+    Notes:
+    ------
+    The normal sd is the MLE, dividing by n (like scipy.stats.norm.fit), not n - 1.
+    The exponential, gamma, and Weibull fits have their location fixed at 0 (like fit(x, floc=0)).
+
+    Examples:
+    ---------
+    fitdistr([5, 1, 10, 3, 4, 3, 6, 4, 5, 2])
+    fitdistr(flights.delay, families=['gamma', 'weibull'], group=flights.route)
+    """
+    unknown = [family for family in families if family not in _FITTERS]
+    if unknown:
+        raise ValueError("Can't fit " + ", ".join(unknown) + "; `families` must be from " + ", ".join(_FITTERS) + ".")
+    x = np.ravel(np.asarray(x, dtype=float))
+    if group is None:
+        codes, labels = np.zeros(len(x), dtype=np.intp), None
+    else:
+        codes, labels = pd.factorize(np.ravel(np.asarray(group)), sort=True)
+        # Drop values with a missing group label
+        x, codes = x[codes >= 0], codes[codes >= 0]
+    groups = 1 if labels is None else len(labels)
+    n = np.bincount(codes, minlength=groups).astype(float)
+    total = lambda values: np.bincount(codes, weights=values, minlength=groups)
+    tables = []
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for family in families:
+            params, loglik = _FITTERS[family](x, codes, n, total, tolerance, max_iter)
+            for name, estimate in zip(_CLASSES[family].names, params):
+                table = pd.DataFrame({'family': family, 'parameter': name, 'estimate': estimate,
+                                      'n': n.astype(np.int64), 'loglik': loglik})
+                if labels is not None:
+                    table.insert(0, 'group', labels)
+                tables.append(table)
+    output = pd.concat(tables, ignore_index=True)
+    if labels is not None:
+        output = output.sort_values('group', kind='stable', ignore_index=True)
+    return output
+
+def _goodness(x, family):
+    """
+    Fit `family` to the sorted data x by maximum likelihood, and score the fit.
+    """
+    fit = fitdistr(x, [family])
+    params = fit.estimate.to_numpy()
+    n, k = len(x), len(params)
+    loglik = fit.loglik.iloc[0]
+    ks = ad = np.nan
+    if n and np.isfinite(params).all():
+        dist = _CLASSES[family](*params)
+        i = np.arange(1, n + 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Kolmogorov-Smirnov: the largest gap between the empirical and fitted CDFs
+            cdf = dist._evaluate('p', x)
+            ks = max(np.max(i / n - cdf), np.max(cdf - (i - 1) / n))
+            # Anderson-Darling, with log CDFs and log upper tails so the extremes don't round to log(0)
+            ad = -n - np.sum((2 * i - 1) * (dist._evaluate('logp', x) + dist._evaluate('logs', x)[::-1])) / n
+    return {'family': family, 'params': dict(zip(fit.parameter, params.tolist())), 'n': n, 'k': k,
+            'loglik': loglik, 'aic': 2 * k - 2 * loglik, 'bic': k * np.log(n) - 2 * loglik, 'ks': ks, 'ad': ad}
+
+def _rank_task(name, shape, family):
+    """
+    Worker task for `rank_fits`: score `family` on the sorted data in shared memory block `name`.
+    """
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        x = np.ndarray(shape, dtype=np.float64, buffer=shared.buf)
+        result = _goodness(x, family)
+        del x
+    finally:
+        shared.close()
+    return result
+
+def rank_fits(x, families=('norm', 'pois', 'exp', 'gamma', 'weibull'), sort_by='aic', workers=None):
+    """
+    Fit each candidate distribution to x by maximum likelihood, and rank them by how well they fit.
+
+    Parameters:
+    -----------
+    x : array-like
+        The data. Missing values are dropped.
+    families : sequence of str, optional, default=('norm', 'pois', 'exp', 'gamma', 'weibull')
+        The candidates: any of the families `fitdistr` can fit.
+    sort_by : str, optional, default='aic'
+        The column to rank by: "aic", "bic", "ks", or "ad" (smallest first), or "loglik" (largest first).
+    workers : int, optional, default=None
+        The number of processes to score the families in, sharing one copy of x.
+        Leave as None to score them one after another in this process.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per family, best fit first: the 'family', its fitted 'params' (a dict of R-style names to values),
+        the sample size 'n', number of parameters 'k', the maximized log-likelihood 'loglik', 'aic' and 'bic',
+        and the Kolmogorov-Smirnov ('ks') and Anderson-Darling ('ad') statistics of the fitted CDF.
+        Families that can't fit the data (e.g. a Poisson for non-counts) get nan and go last.
+
+    Notes:
+    ------
+    The KS and AD statistics compare the data with the fitted distribution's CDF. Because the parameters
+    were fitted to the same data, their usual p-values don't apply; use them to compare candidates.
+    For discrete families (pois) they are only approximate.
+
+    Examples:
+    ---------
+    rank_fits(sw)
+    rank_fits(delays, families=['exp', 'gamma', 'weibull'], sort_by='bic', workers=3)
+    """
+    unknown = [family for family in families if family not in _FITTERS]
+    if unknown:
+        raise ValueError("Can't fit " + ", ".join(unknown) + "; `families` must be from " + ", ".join(_FITTERS) + ".")
+    if sort_by not in ('loglik', 'aic', 'bic', 'ks', 'ad'):
+        raise ValueError("`sort_by` must be one of loglik, aic, bic, ks, ad.")
+    x = np.ravel(np.asarray(x, dtype=float))
+    x = np.sort(x[~np.isnan(x)])
+    if workers is None:
+        rows = [_goodness(x, family) for family in families]
+    else:
+        if workers < 1:
+            raise ValueError("`workers` must be at least 1.")
+        shared = shared_memory.SharedMemory(create=True, size=max(x.nbytes, 1))
+        try:
+            np.ndarray(x.shape, dtype=np.float64, buffer=shared.buf)[:] = x
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                tasks = [pool.submit(_rank_task, shared.name, x.shape, family) for family in families]
+                rows = [task.result() for task in tasks]
+        finally:
+            shared.close()
+            shared.unlink()
+    output = pd.DataFrame(rows, columns=['family', 'params', 'n', 'k', 'loglik', 'aic', 'bic', 'ks', 'ad'])
+    output = output.sort_values(sort_by, ascending=(sort_by != 'loglik'), na_position='last', kind='stable', ignore_index=True)
+    return output
 
 # Simple visualization #############################
 
 # Want to make a quick histogram?
-def hist(x):
+def hist(x, bins=30, binwidth=None, rule=None, lower=None, upper=None):
   """
   Make a quick histogram, in syntax matching the method in R.
   
+  The values are counted into bins with numpy first, so only the bins get plotted,
+  and drawing takes the same time for 100 values or 100 million.
+  
   Parameters:
-    x: a pandas Series of values to be turned into a histogram
+    x: a pandas Series of values to be turned into a histogram;
+       or an iterable of chunks of values (e.g. from stream()), which needs `lower` and `upper`;
+       or a Histogram that's already been filled.
+    bins: the number of equal-width bins (default 30, like geom_histogram()).
+    binwidth: the width of each bin. Overrides `bins`.
+    rule: a rule for choosing the bin width from the data, like 'sturges', 'scott', 'fd', or 'auto'
+          (see numpy.histogram_bin_edges()). Overrides `bins`. Needs `x` in memory.
+    lower, upper: the range to bin over. Defaults to the range of `x`.
     
   Returns: 
     figure: a ggplot figure object.
   """
-  from plotnine import ggplot, geom_histogram, aes
-  output = ggplot(aes(x = x)) + geom_histogram()
+  from plotnine import ggplot, geom_rect, aes, labs
+  if isinstance(x, Histogram):
+    h = x
+  elif isinstance(x, (pd.Series, np.ndarray, list, tuple)):
+    x = np.ravel(np.asarray(x, dtype=float))
+    x = x[np.isfinite(x)]
+    if lower is None:
+      lower = x.min() if len(x) else 0.0
+    if upper is None:
+      upper = x.max() if len(x) else 1.0
+    if not upper > lower:
+      # All one value: center a unit-wide range on it, as numpy does
+      lower, upper = lower - 0.5, upper + 0.5
+    if rule is not None:
+      bins = len(np.histogram_bin_edges(x, bins=rule, range=(lower, upper))) - 1
+    elif binwidth is not None:
+      bins = max(int(np.ceil((upper - lower) / binwidth)), 1)
+      upper = lower + bins * binwidth
+    h = Histogram(lower, upper, bins).update(x)
+  else:
+    if lower is None or upper is None or rule is not None:
+      raise ValueError("To bin chunks as they stream in, give `lower` and `upper` (and `bins` or `binwidth`, not `rule`).")
+    if binwidth is not None:
+      bins = max(int(np.ceil((upper - lower) / binwidth)), 1)
+      upper = lower + bins * binwidth
+    h = Histogram(lower, upper, bins)
+    consume(x, h)
+  output = ggplot(h.tidy(), aes(xmin = 'lower', xmax = 'upper', ymin = 0, ymax = 'count')) + geom_rect() + labs(x = 'x', y = 'count')
   return output
 
 # Skewness & Kurtosis ##############################
+
+class Moments:
+    """
+    Running count, mean, and central moments (M2, M3, M4) of a stream of values,
+    built up a chunk at a time with `update`, or combined across workers with `merge`.
+    Each chunk is visited once, so you can summarize data too big to hold in memory.
+
+    Attributes:
+    -----------
+    count : int
+        How many values have been seen.
+    mean : float
+        Their mean.
+    m2, m3, m4 : float
+        Their sums of squared, cubed, and 4th-power deviations from the mean.
+
+    Examples:
+    ---------
+    m = Moments()
+    for chunk in pd.read_csv("big.csv", chunksize=10**6):
+        m.update(chunk.delay)
+    m.mean, m.sd, m.skewness, m.kurtosis
+
+    # Or summarize pieces separately (e.g. in worker processes), then combine them
+    Moments().update(x[:500]).merge(Moments().update(x[500:]))
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, chunk):
+        """
+        Add a chunk of values.
+        """
+        chunk = np.ravel(np.asarray(chunk, dtype=float))
+        if chunk.size == 0:
+            return self
+        other = Moments()
+        other.count = chunk.size
+        other.mean = chunk.mean()
+        diff = chunk - other.mean
+        power = diff * diff
+        other.m2 = power.sum()
+        power *= diff
+        other.m3 = power.sum()
+        power *= diff
+        other.m4 = power.sum()
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        Fold another Moments' values into this one, as if both had seen all the values
+        (the pairwise update of Chan et al., extended to 3rd and 4th moments by Pebay).
+        """
+        a, b = self.count, other.count
+        if b == 0:
+            return self
+        n = a + b
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta**2 * a * b / n
+        m3 = (self.m3 + other.m3 + delta**3 * a * b * (a - b) / n**2
+              + 3 * delta * (a * other.m2 - b * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta**4 * a * b * (a * a - a * b + b * b) / n**3
+              + 6 * delta**2 * (a * a * other.m2 + b * b * self.m2) / n**2
+              + 4 * delta * (a * other.m3 - b * self.m3) / n)
+        self.count = n
+        self.mean += delta * b / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        return self
+
+    @property
+    def var(self):
+        """The sample variance (dividing by count - 1, like pandas)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def sd(self):
+        """The sample standard deviation."""
+        return np.sqrt(self.var)
+
+    @property
+    def skewness(self):
+        """Skewness, as in `skewness()`: M3 / ((count - 1) * sd**3)."""
+        return self.m3 / ((self.count - 1) * self.sd**3) if self.count > 1 else np.nan
+
+    @property
+    def kurtosis(self):
+        """Kurtosis, as in `kurtosis()`: M4 / ((count - 1) * sd**4)."""
+        return self.m4 / ((self.count - 1) * self.var**2) if self.count > 1 else np.nan
+
 def skewness(x):
-    from pandas import Series
-    x = Series(x)
-    diff = x - x.mean()
-    n = len(x) - 1
-    sigma = x.std()
-    output = sum(diff**3) / (n * sigma**3)
+    output = Moments().update(x).skewness
     return output
 
 def kurtosis(x):
-    from pandas import Series
-    x = Series(x)
-    diff = x - x.mean()
-    n = len(x) - 1
-    sigma = x.std()
-    output = sum(diff**4) / (n * sigma**4)
+    output = Moments().update(x).kurtosis
     return output
 
 
 # Probability Distribution Functions ####################
 
-def seq(from_, to, length_out=None, by=None):
+class LazySeq:
+    """
+    An evenly spaced sequence of numbers that only computes its values when you ask for them,
+    as returned by `seq(..., lazy=True)`.
+
+    Element i is `from_ + i * by`. It supports len(), indexing, slicing (which gives another LazySeq),
+    and iteration, and turns into a numpy array with `values()` or `numpy.asarray()`.
+
+    Parameters:
+    -----------
+    from_ : float
+        The first value.
+    by : float
+        The step between consecutive values.
+    length : int
+        The number of values.
+    to : float, optional, default=None
+        If given, the exact last value (so rounding in `by` can't nudge the endpoint).
+    """
+
+    def __init__(self, from_, by, length, to=None):
+        self.from_ = from_
+        self.by = by
+        self.length = length
+        self.to = to
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            sub = range(self.length)[key]
+            last = len(sub) > 0 and sub[-1] == self.length - 1
+            return LazySeq(self.from_ + sub.start * self.by, self.by * sub.step, len(sub),
+                           self.to if last else None)
+        i = range(self.length)[key]
+        if i == self.length - 1 and self.to is not None:
+            return self.to
+        return self.from_ + i * self.by
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        output = self.values()
+        return output if dtype is None else output.astype(dtype)
+
+    def __repr__(self):
+        return "LazySeq(from_=%r, by=%r, length=%r)" % (self.from_, self.by, self.length)
+
+    def values(self):
+        """
+        Compute all the values, as a numpy array.
+        """
+        output = np.arange(self.length) * self.by + self.from_
+        if self.to is not None and self.length > 0:
+            output[-1] = self.to
+        return output
+
+def seq(from_, to, length_out=None, by=None, lazy=False):
     """
     Generate a sequence of numbers, similar to R's `seq` function.
 
@@ -60,11 +1704,15 @@ def seq(from_, to, length_out=None, by=None):
         The number of elements to generate in the sequence. Exactly one of `length_out` or `by` must be specified.
     by : float, optional, default=None
         The step size between consecutive values in the sequence. Exactly one of `length_out` or `by` must be specified.
+    lazy : bool, optional, default=False
+        If True, return a `LazySeq`, which computes values only when they're used,
+        instead of building the whole sequence up front.
 
     Returns:
     --------
     pandas.Series
         A Series containing the sequence of values, either generated based on the specified length or step size.
+        (A `LazySeq` instead, if `lazy=True`.)
 
     Raises:
     -------
@@ -72,20 +1720,21 @@ def seq(from_, to, length_out=None, by=None):
         - If both `length_out` and `by` are provided, or if neither is provided.
         - If `length_out` is less than 1.
         - If `by` is zero.
+        - If `by` points away from `to`.
 
     Notes:
     ------
     - If `length_out` is provided, the function will generate a sequence with exactly that many points, distributed evenly between `from_` and `to`.
     - If `by` is provided, the function will generate a sequence with a step size of `by`, starting from `from_` and ending at or before `to`.
-    - The sequence is generated using `pandas.Series` for flexibility and efficient operations.
+      Like R, it allows a little floating point slack, so seq(0, 0.3, by=0.1) ends at 0.3 even though 0.3 / 0.1 is 2.9999999999999996.
+    - The sequence is computed in one vectorized pass with numpy, matching `numpy.linspace` for `length_out`.
 
     Examples:
     ---------
     seq(0, 1, length_out=10)
     seq(-3, 1, by=0.1)
+    seq(0, 100, length_out=10**8, lazy=True)[::10**7]
     """
-    import pandas as pd
-    
     if length_out is not None and by is not None:
         raise ValueError("Only one of `length_out` or `by` should be provided.")
     
@@ -93,21 +1742,28 @@ def seq(from_, to, length_out=None, by=None):
     if length_out is not None:
         if length_out < 1:
             raise ValueError("`length_out` must be at least 1.")
-        sequence = pd.Series(pd.Series(range(length_out)).apply(lambda x: from_ + (to - from_) * x / (length_out - 1)))
+        length_out = int(length_out)
+        step = (to - from_) / (length_out - 1) if length_out > 1 else 0
+        sequence = LazySeq(from_, step, length_out, to if length_out > 1 else None)
     
     # Generate sequence based on `by`
     elif by is not None:
         if by == 0:
             raise ValueError("`by` must be non-zero.")
-        sequence = pd.Series(range(int((to - from_) / by) + 1)).apply(lambda x: from_ + x * by)
+        steps = (to - from_) / by
+        if steps < 0:
+            raise ValueError("`by` must point from `from_` towards `to`.")
+        sequence = LazySeq(from_, by, int(np.floor(steps + 1e-10)) + 1)
     
     else:
         raise ValueError("Either `length_out` or `by` must be provided.")
     
-    return sequence
+    if lazy:
+        return sequence
+    return pd.Series(sequence.values())
 
 
-def density(x):
+def density(x, bw_method=None):
     """
     Estimate the probability density function (PDF) of a given dataset using Gaussian Kernel Density Estimation (KDE).
 
@@ -115,6 +1771,9 @@ def density(x):
     -----------
     x : array-like
         A list or array of data points for which the density is to be estimated.
+    bw_method : str, scalar, or callable, optional, default=None
+        How to pick the bandwidth: "scott" (the default), "silverman", or anything else
+        `scipy.stats.gaussian_kde` accepts.
 
     Returns:
     --------
@@ -126,12 +1785,51 @@ def density(x):
     This function uses `scipy.stats.gaussian_kde` to estimate the kernel density of the input data.
     The resulting model can be evaluated at any point to estimate the density at that point.
     """
-    from scipy.stats import gaussian_kde as density
-    output = density(x)
+    output = stats.gaussian_kde(x, bw_method=bw_method)
     return output
 
 
-def tidy_density(model, n=1000):
+# Above this many (data points x grid points), tidy_density() switches to the binned KDE
+BINNED_CELLS = 10**7
+
+# The binned KDE's grid is at least this many points per bandwidth (up to _MAX_BINS points)
+_BINS_PER_BANDWIDTH = 20
+_MAX_BINS = 2**20
+
+def _binned_density(model, lower, upper, n):
+    """
+    Evaluate a 1-D gaussian_kde on an even grid of n points from lower to upper, by binning.
+
+    The data are linearly binned (each point's weight split between its two nearest grid points)
+    onto a grid with at least _BINS_PER_BANDWIDTH points per bandwidth, then convolved with the
+    Gaussian kernel (cut off at 6 bandwidths) by FFT, and finally interpolated onto the n output points.
+    That costs O(data + grid log grid), instead of O(data x grid) for the exact sum.
+    """
+    data = model.dataset[0]
+    bandwidth = np.sqrt(model.covariance[0, 0])
+    size = int(np.clip(np.ceil((upper - lower) / bandwidth * _BINS_PER_BANDWIDTH) + 1, n, _MAX_BINS))
+    delta = (upper - lower) / (size - 1)
+
+    # Linear binning
+    position = (data - lower) / delta
+    left = np.clip(np.floor(position), 0, size - 2).astype(np.intp)
+    right_share = model.weights * (position - left)
+    counts = (np.bincount(left, weights=model.weights - right_share, minlength=size)
+              + np.bincount(left + 1, weights=right_share, minlength=size))
+
+    # Convolve with the kernel, zero-padded so the FFT doesn't wrap around
+    reach = min(size - 1, int(np.ceil(6 * bandwidth / delta)))
+    offsets = np.arange(-reach, reach + 1) * (delta / bandwidth)
+    kernel = np.exp(-0.5 * offsets**2) / (bandwidth * _SQRT_2PI)
+    padded = 1 << int(np.ceil(np.log2(size + 2 * reach)))
+    smoothed = np.fft.irfft(np.fft.rfft(counts, padded) * np.fft.rfft(kernel, padded), padded)
+    smoothed = np.maximum(smoothed[reach:reach + size], 0)
+
+    if size == n:
+        return smoothed
+    return np.interp(np.linspace(lower, upper, n), np.linspace(lower, upper, size), smoothed)
+
+def tidy_density(model, n=1000, method='auto'):
     """
     Estimate the probability density function (PDF) over a range of values using a Gaussian KDE model and return it in a tidy format.
 
@@ -141,6 +1839,10 @@ def tidy_density(model, n=1000):
         A kernel density estimate model (e.g., the result from the `density` function) that can evaluate density at given points.
     n : int, optional, default=1000
         The number of points over which to estimate the density. The range of points is determined by the minimum and maximum of the dataset.
+    method : str, optional, default='auto'
+        "exact" evaluates the model at every point; "binned" uses a binned, FFT-convolved KDE
+        (1-D `scipy.stats.gaussian_kde` models only); "auto" picks "binned" once
+        (data points x n) passes BINNED_CELLS.
 
     Returns:
     --------
@@ -152,15 +1854,103 @@ def tidy_density(model, n=1000):
     This function uses `numpy.linspace` to generate a range of values from the minimum to the maximum of the dataset,
     and then evaluates the density at those points using the provided model.
     The result is returned as a tidy DataFrame with 'x' and 'y' columns.
-    """
-    from numpy import linspace
-    from pandas import Series, DataFrame
-    values = linspace(start=model.dataset.min(), stop=model.dataset.max(), num=n)
-    densities = model(values)
-    output = DataFrame({'x': Series(values), 'y': Series(densities)})
+
+    The binned KDE uses the model's own bandwidth (so Scott's or Silverman's rule, as scipy picked it)
+    and stays within 0.1% of the exact KDE's peak density everywhere (typically a few hundredths of a percent).
+    """
+    if method not in ('auto', 'exact', 'binned'):
+        raise ValueError("`method` must be one of auto, exact, binned.")
+    kde = isinstance(model, stats.gaussian_kde) and model.d == 1
+    if method == 'binned' and not kde:
+        raise ValueError("method='binned' needs a 1-D scipy.stats.gaussian_kde model.")
+    if method == 'auto':
+        method = 'binned' if kde and model.n * n > BINNED_CELLS else 'exact'
+    lower, upper = model.dataset.min(), model.dataset.max()
+    values = np.linspace(start=lower, stop=upper, num=n)
+    if method == 'binned':
+        densities = _binned_density(model, lower, upper, n)
+    else:
+        densities = model(values)
+    output = pd.DataFrame({'x': pd.Series(values), 'y': pd.Series(densities)})
     return output
 
-def approxfun(data, fill_value='extrapolate', bounds_error=False):
+class Interpolator:
+    """
+    A linear interpolation function through points (x, y), as returned by `approxfun`.
+
+    Call it on new x values to get interpolated y values. It is built from plain numpy arrays,
+    so it pickles cheaply (e.g. to send to worker processes).
+
+    Parameters:
+    -----------
+    x, y : array-like
+        The points to interpolate between.
+    fill_value : str, scalar, or (scalar, scalar), optional, default='extrapolate'
+        What to return outside the range of `x`: 'extrapolate' extends the first and last segments;
+        a scalar fills both sides; a pair fills below and above separately.
+    bounds_error : bool, optional, default=False
+        If True, raise a ValueError when asked for values outside the range of `x`.
+    assume_sorted : bool, optional, default=False
+        Set to True if `x` is already in increasing order, to skip sorting it.
+    """
+
+    def __init__(self, x, y, fill_value='extrapolate', bounds_error=False, assume_sorted=False):
+        x = np.ravel(np.asarray(x, dtype=float))
+        y = np.ravel(np.asarray(y, dtype=float))
+        if len(x) != len(y):
+            raise ValueError("`x` and `y` must be the same length.")
+        if len(x) < 2:
+            raise ValueError("Need at least 2 points to interpolate between.")
+        if not assume_sorted and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+        self.x = x
+        self.y = y
+        self.fill_value = fill_value
+        self.bounds_error = bounds_error
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._slope = (y[1] - y[0]) / (x[1] - x[0]), (y[-1] - y[-2]) / (x[-1] - x[-2])
+
+    def __call__(self, x, out=None):
+        """
+        Interpolate at x. If `out` (a float array shaped like x) is given, write the results into it.
+        """
+        x = np.asarray(x, dtype=float)
+        if out is None:
+            out = np.empty(x.shape)
+        if self.bounds_error and (np.any(x < self.x[0]) or np.any(x > self.x[-1])):
+            raise ValueError("A value in x is outside the interpolation range.")
+        if isinstance(self.fill_value, str) and self.fill_value == 'extrapolate':
+            out[...] = np.interp(x, self.x, self.y)
+            # Beyond the ends, follow the first or last segment's line
+            below, above = x < self.x[0], x > self.x[-1]
+            out[below] = self.y[0] + (x[below] - self.x[0]) * self._slope[0]
+            out[above] = self.y[-1] + (x[above] - self.x[-1]) * self._slope[-1]
+        else:
+            below, above = self.fill_value if np.ndim(self.fill_value) else (self.fill_value, self.fill_value)
+            out[...] = np.interp(x, self.x, self.y, left=below, right=above)
+        return out if out.ndim else out[()]
+
+    def inverse(self, fill_value=None):
+        """
+        Swap x and y, to get the inverse function: for example, turning a CDF (x -> probability)
+        into a quantile function (probability -> x). y must not decrease as x increases.
+        Where y repeats (a flat stretch), the inverse takes the first x with that y.
+
+        Parameters:
+        -----------
+        fill_value : optional, default=None
+            Outside-the-range behaviour for the inverse (as in `Interpolator`).
+            Defaults to clamping to the first and last x.
+        """
+        if np.any(np.diff(self.y) < 0):
+            raise ValueError("Can only invert an interpolator whose y values never decrease.")
+        y, first = np.unique(self.y, return_index=True)
+        if fill_value is None:
+            fill_value = (self.x[0], self.x[-1])
+        return Interpolator(y, self.x[first], fill_value=fill_value, assume_sorted=True)
+
+def approxfun(data, fill_value='extrapolate', bounds_error=False, assume_sorted=False):
     """
     Approximate a DataFrame of x and y data into a linear interpolation function.
 
@@ -176,19 +1966,28 @@ def approxfun(data, fill_value='extrapolate', bounds_error=False):
     bounds_error : bool, optional, default=False
         If True, raises an error when attempting to interpolate outside the bounds of the data.
         If False, the `fill_value` will be used for out-of-bounds data.
+    assume_sorted : bool, optional, default=False
+        Set to True if `data.x` is already in increasing order (as from `tidy_density`), to skip sorting it.
 
     Returns:
     --------
-    function
+    Interpolator
         An interpolation function that can be used to approximate y values for given x inputs.
+        Use its `inverse()` to go from y back to x.
 
     Notes:
     ------
-    This function uses `scipy.interpolate.interp1d` to create a linear interpolation function from
-    the provided x and y data.
+    This function builds an `Interpolator`, which evaluates with `numpy.searchsorted` and `numpy.interp`
+    over whole arrays at once, and can write into a preallocated array with `out=`.
+
+    Examples:
+    ---------
+    d = tidy_density(density(x))
+    d['y'] = d.y.cumsum() / d.y.sum()    # turn the density into a CDF
+    q = approxfun(d, assume_sorted=True).inverse()
+    q(runif(10**6))    # inverse-transform sampling from the estimated distribution
     """
-    from scipy.interpolate import interp1d
-    output = interp1d(data.x, data.y, kind='linear', fill_value=fill_value, bounds_error=bounds_error)
+    output = Interpolator(data.x, data.y, fill_value=fill_value, bounds_error=bounds_error, assume_sorted=assume_sorted)
     return output
 
 
@@ -210,14 +2009,13 @@ def exp(x=1):
     ------
     This function uses `numpy.exp` to compute the exponential of the input value.
     """
-    from numpy import exp
-    output = exp(x)
+    output = np.exp(x)
     return output
 
 
 ## Normal Distribution ##########################
 
-def dnorm(x, mean=0, sd=1):
+def dnorm(x, mean=0, sd=1, out=None, log=False):
     """
     Computes the probability density function (PDF) of a normal distribution.
 
@@ -228,6 +2026,11 @@ def dnorm(x, mean=0, sd=1):
         The mean (center) of the normal distribution (default is 0).
     sd : float, optional
         The standard deviation (spread) of the normal distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log density (default is False).
 
     Returns:
     pandas.Series
@@ -240,13 +2043,10 @@ def dnorm(x, mean=0, sd=1):
     2    0.241971
     dtype: float64
     """
-    from scipy.stats import norm
-    from pandas import Series
-    output = norm.pdf(x, loc=mean, scale=sd)
-    output = Series(output)
+    output = Normal(mean, sd).d(x, out, log)
     return output
 
-def pnorm(x, mean=0, sd=1):
+def pnorm(x, mean=0, sd=1, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a normal distribution.
 
@@ -257,6 +2057,13 @@ def pnorm(x, mean=0, sd=1):
         The mean (center) of the normal distribution (default is 0).
     sd : float, optional
         The standard deviation (spread) of the normal distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -269,15 +2076,10 @@ def pnorm(x, mean=0, sd=1):
     2    0.841345
     dtype: float64
     """
-    from scipy.stats import norm  # Import norm from scipy.stats for CDF computation
-    from pandas import Series     # Import Series from pandas to return results as a Series
-
-    output = norm.cdf(x, loc=mean, scale=sd)  # Compute the CDF for given x, mean, and sd
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Normal(mean, sd).p(x, out, lower_tail, log_p)
     return output
 
-def qnorm(x, mean=0, sd=1):
+def qnorm(x, mean=0, sd=1, out=None):
     """
     Computes the quantile function (inverse CDF) of a normal distribution.
 
@@ -288,6 +2090,9 @@ def qnorm(x, mean=0, sd=1):
         The mean (center) of the normal distribution (default is 0).
     sd : float, optional
         The standard deviation (spread) of the normal distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     float or array-like
@@ -300,14 +2105,10 @@ def qnorm(x, mean=0, sd=1):
     2   1.675082
     dtype: float64
     """
-    from scipy.stats import norm  # Import norm from scipy.stats for inverse CDF (PPF) computation
-    from pandas import Series     # Import Series from pandas for consistent data handling
-
-    output = norm.ppf(x, loc=mean, scale=sd)  # Compute the inverse CDF for given x, mean, and sd
-    output = Series(output)  # Convert the output to a pandas Series
+    output = Normal(mean, sd).q(x, out)
     return output
 
-def rnorm(n, mean=0, sd=1):
+def rnorm(n, mean=0, sd=1, out=None, rng=None, workers=None):
     """
     Generates random samples from a normal distribution.
 
@@ -318,6 +2119,15 @@ def rnorm(n, mean=0, sd=1):
         The mean (center) of the normal distribution (default is 0).
     sd : float, optional
         The standard deviation (spread) of the normal distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional
+        The random number generator to draw from (default is the module-wide one; see `set_seed`).
+    workers : int, optional
+        The number of processes to split the draws across (default is None, for no splitting).
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     pandas.Series
@@ -332,16 +2142,11 @@ def rnorm(n, mean=0, sd=1):
     4    0.927883
     dtype: float64
     """
-    from scipy.stats import norm  # Import norm from scipy.stats for random sample generation
-    from pandas import Series     # Import Series from pandas to return results as a Series
-
-    output = norm.rvs(loc=mean, scale=sd, size=n)  # Generate n random samples with given mean and sd
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Normal(mean, sd).r(n, out, rng, workers)
     return output
 
 ## Exponential Distribution ##########################
-def dexp(x, rate=0.01):
+def dexp(x, rate=0.01, out=None, log=False):
     """
     Computes the probability density function (PDF) of an exponential distribution.
 
@@ -351,6 +2156,11 @@ def dexp(x, rate=0.01):
     rate : float, optional
         The rate parameter (lambda) of the exponential distribution (default is 0.01).
         Note: The scale parameter is the inverse of the rate (1/rate).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log density (default is False).
 
     Returns:
     pandas.Series
@@ -363,15 +2173,10 @@ def dexp(x, rate=0.01):
     2    0.111565
     dtype: float64
     """
-    from scipy.stats import expon  # Import expon from scipy.stats for PDF computation
-    from pandas import Series      # Import Series from pandas to return results as a Series
-
-    output = expon.pdf(x, loc=0, scale=1/rate)  # Compute the PDF for given x and rate
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Exponential(rate).d(x, out, log)
     return output
 
-def pexp(x, rate=0.01):
+def pexp(x, rate=0.01, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of an exponential distribution.
 
@@ -381,6 +2186,13 @@ def pexp(x, rate=0.01):
     rate : float, optional
         The rate parameter (lambda) of the exponential distribution (default is 0.01).
         Note: The scale parameter is the inverse of the rate (1/rate).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -393,15 +2205,10 @@ def pexp(x, rate=0.01):
     2    0.776870
     dtype: float64
     """
-    from scipy.stats import expon  # Import expon from scipy.stats for CDF computation
-    from pandas import Series      # Import Series from pandas to return results as a Series
-
-    output = expon.cdf(x, loc=0, scale=1/rate)  # Compute the CDF for given x and rate
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Exponential(rate).p(x, out, lower_tail, log_p)
     return output
 
-def qexp(x, rate=0.01):
+def qexp(x, rate=0.01, out=None):
     """
     Computes the quantile function (inverse CDF) of an exponential distribution.
 
@@ -411,6 +2218,9 @@ def qexp(x, rate=0.01):
     rate : float, optional
         The rate parameter (lambda) of the exponential distribution (default is 0.01).
         Note: The scale parameter is the inverse of the rate (1/rate).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     pandas.Series
@@ -423,15 +2233,10 @@ def qexp(x, rate=0.01):
     2    2.079442
     dtype: float64
     """
-    from scipy.stats import expon  # Import expon from scipy.stats for inverse CDF (PPF) computation
-    from pandas import Series      # Import Series from pandas to return results as a Series
-
-    output = expon.ppf(x, loc=0, scale=1/rate)  # Compute the inverse CDF for given x and rate
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Exponential(rate).q(x, out)
     return output
 
-def rexp(n, rate=0.01):
+def rexp(n, rate=0.01, out=None, rng=None, workers=None):
     """
     Generates random samples from an exponential distribution.
 
@@ -441,6 +2246,15 @@ def rexp(n, rate=0.01):
     rate : float, optional
         The rate parameter (lambda) of the exponential distribution (default is 0.01).
         Note: The scale parameter is the inverse of the rate (1/rate).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional
+        The random number generator to draw from (default is the module-wide one; see `set_seed`).
+    workers : int, optional
+        The number of processes to split the draws across (default is None, for no splitting).
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     pandas.Series
@@ -455,17 +2269,11 @@ def rexp(n, rate=0.01):
     4    1.235874
     dtype: float64
     """
-    from scipy.stats import expon  # Import expon from scipy.stats for random sample generation
-    from pandas import Series      # Import Series from pandas to return results as a Series
-
-    output = expon.rvs(loc=0, scale=1/rate, size=n)  # Generate n random samples with given rate
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Exponential(rate).r(n, out, rng, workers)
     return output
 
-
 ## Weibull Distribution ##########################
-def dweibull(x, shape=2, scale=1):
+def dweibull(x, shape=2, scale=1, out=None, log=False):
     """
     Computes the probability density function (PDF) of a Weibull distribution.
 
@@ -476,6 +2284,11 @@ def dweibull(x, shape=2, scale=1):
         The shape parameter m of the Weibull distribution (default is 2).
     scale : float, optional
         The scale parameter c of the Weibull distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log density (default is False).
 
     Returns:
     pandas.Series
@@ -488,15 +2301,10 @@ def dweibull(x, shape=2, scale=1):
     2    0.059897
     dtype: float64
     """
-    from scipy.stats import weibull_min  # Import weibull_min from scipy.stats for PDF computation
-    from pandas import Series            # Import Series from pandas to return results as a Series
-
-    output = weibull_min.pdf(x, c=shape, scale=scale)  # Compute the PDF for given x, shape, and scale
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Weibull(shape, scale).d(x, out, log)
     return output
 
-def pweibull(x, shape=2, scale=1):
+def pweibull(x, shape=2, scale=1, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a Weibull distribution.
 
@@ -507,6 +2315,13 @@ def pweibull(x, shape=2, scale=1):
         The shape parameter m of the Weibull distribution (default is 2).
     scale : float, optional
         The scale parameter c of the Weibull distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -519,15 +2334,10 @@ def pweibull(x, shape=2, scale=1):
     2    0.999664
     dtype: float64
     """
-    from scipy.stats import weibull_min  # Import weibull_min from scipy.stats for CDF computation
-    from pandas import Series            # Import Series from pandas to return results as a Series
-
-    output = weibull_min.cdf(x, c=shape, scale=scale)  # Compute the CDF for given x, shape, and scale
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Weibull(shape, scale).p(x, out, lower_tail, log_p)
     return output
 
-def qweibull(x, shape=2, scale=1):
+def qweibull(x, shape=2, scale=1, out=None):
     """
     Computes the quantile function (inverse CDF) of a Weibull distribution.
 
@@ -538,6 +2348,9 @@ def qweibull(x, shape=2, scale=1):
         The shape parameter m of the Weibull distribution (default is 2).
     scale : float, optional
         The scale parameter c of the Weibull distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     pandas.Series
@@ -550,15 +2363,10 @@ def qweibull(x, shape=2, scale=1):
     2    1.177410
     dtype: float64
     """
-    from scipy.stats import weibull_min  # Import weibull_min from scipy.stats for inverse CDF (PPF) computation
-    from pandas import Series            # Import Series from pandas to return results as a Series
-
-    output = weibull_min.ppf(x, c=shape, scale=scale)  # Compute the inverse CDF for given x, shape, and scale
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Weibull(shape, scale).q(x, out)
     return output
 
-def rweibull(n, shape=2, scale=1):
+def rweibull(n, shape=2, scale=1, out=None, rng=None, workers=None):
     """
     Generates random samples from a Weibull distribution.
 
@@ -569,6 +2377,15 @@ def rweibull(n, shape=2, scale=1):
         The shape parameter m of the Weibull distribution (default is 2).
     scale : float, optional
         The scale parameter c of the Weibull distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional
+        The random number generator to draw from (default is the module-wide one; see `set_seed`).
+    workers : int, optional
+        The number of processes to split the draws across (default is None, for no splitting).
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     pandas.Series
@@ -583,17 +2400,11 @@ def rweibull(n, shape=2, scale=1):
     4    1.035347
     dtype: float64
     """
-    from scipy.stats import weibull_min  # Import weibull_min from scipy.stats for random sample generation
-    from pandas import Series            # Import Series from pandas to return results as a Series
-
-    output = weibull_min.rvs(c=shape, scale=scale, size=n)  # Generate n random samples with given shape and scale
-    output = Series(output)  # Convert the output to a pandas Series
-
+    output = Weibull(shape, scale).r(n, out, rng, workers)
     return output
 
-
 ## Gamma Distribution ##########################
-def dgamma(x, shape=2, rate=1):
+def dgamma(x, shape=2, rate=1, out=None, log=False):
     """
     Computes the probability density function (PDF) of a Gamma distribution.
 
@@ -604,6 +2415,11 @@ def dgamma(x, shape=2, rate=1):
         The shape parameter of the Gamma distribution (default is 2).
     rate : float, optional
         The rate parameter (inverse of scale) of the Gamma distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log density (default is False).
 
     Returns:
     pandas.Series
@@ -616,14 +2432,10 @@ def dgamma(x, shape=2, rate=1):
     2    0.149361
     dtype: float64
     """
-    from scipy.stats import gamma
-    from pandas import Series
-
-    output = gamma.pdf(x, a=shape, scale=1/rate)
-    output = Series(output)
+    output = Gamma(shape, rate).d(x, out, log)
     return output
 
-def pgamma(x, shape=2, rate=1):
+def pgamma(x, shape=2, rate=1, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a Gamma distribution.
 
@@ -634,6 +2446,13 @@ def pgamma(x, shape=2, rate=1):
         The shape parameter of the Gamma distribution (default is 2).
     rate : float, optional
         The rate parameter (inverse of scale) of the Gamma distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -646,14 +2465,10 @@ def pgamma(x, shape=2, rate=1):
     2    0.800852
     dtype: float64
     """
-    from scipy.stats import gamma
-    from pandas import Series
-
-    output = gamma.cdf(x, a=shape, scale=1/rate)
-    output = Series(output)
+    output = Gamma(shape, rate).p(x, out, lower_tail, log_p)
     return output
 
-def qgamma(x, shape=2, rate=1):
+def qgamma(x, shape=2, rate=1, out=None):
     """
     Compute the quantile (inverse cumulative distribution function) of the gamma distribution
     for given probabilities.
@@ -666,6 +2481,9 @@ def qgamma(x, shape=2, rate=1):
         The shape parameter (k) of the gamma distribution.
     rate : float, optional, default=1
         The rate parameter (λ) of the gamma distribution, which is the inverse of the scale parameter.
+    out : numpy.ndarray, optional, default=None
+        A preallocated array to write the results into.
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     --------
@@ -677,14 +2495,10 @@ def qgamma(x, shape=2, rate=1):
     This function uses `scipy.stats.gamma.ppf` to compute the quantiles of the gamma distribution.
     The shape parameter corresponds to the 'k' parameter in the gamma distribution, and the rate is the inverse of the scale parameter.
     """
-    from scipy.stats import gamma
-    from pandas import Series
-    output = gamma.ppf(x, a=shape, scale=1/rate)
-    output = Series(output)
+    output = Gamma(shape, rate).q(x, out)
     return output
 
-
-def rgamma(n, shape=2, rate=1):
+def rgamma(n, shape=2, rate=1, out=None, rng=None, workers=None):
     """
     Generate random samples from the gamma distribution.
 
@@ -696,6 +2510,15 @@ def rgamma(n, shape=2, rate=1):
         The shape parameter (k) of the gamma distribution.
     rate : float, optional, default=1
         The rate parameter (λ) of the gamma distribution, which is the inverse of the scale parameter.
+    out : numpy.ndarray, optional, default=None
+        A preallocated array to write the results into.
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional, default=None
+        The random number generator to draw from. Defaults to the module-wide one (see `set_seed`).
+    workers : int, optional, default=None
+        The number of processes to split the draws across. Leave as None for no splitting.
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     --------
@@ -704,18 +2527,15 @@ def rgamma(n, shape=2, rate=1):
     
     Notes:
     ------
-    This function uses `scipy.stats.gamma.rvs` to generate the random samples from the gamma distribution.
+    This function uses `numpy.random.Generator.gamma` to generate the random samples from the gamma distribution.
     The shape parameter corresponds to the 'k' parameter, and the rate is the inverse of the scale parameter.
     """
-    from scipy.stats import gamma
-    from pandas import Series
-    output = gamma.rvs(a=shape, scale=1/rate, size=n)
-    output = Series(output)
+    output = Gamma(shape, rate).r(n, out, rng, workers)
     return output
 
 ## Poisson Distribution ##########################
 
-def dpois(x, mu=1):
+def dpois(x, mu=1, out=None, log=False):
     """
     Computes the probability mass function (PMF) of a Poisson distribution.
 
@@ -724,6 +2544,11 @@ def dpois(x, mu=1):
         The input values where the PMF is evaluated.
     mu : float, optional
         The expected number of occurrences (mean) of the Poisson distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log probability (default is False).
 
     Returns:
     pandas.Series
@@ -736,14 +2561,10 @@ def dpois(x, mu=1):
     2    0.183940
     dtype: float64
     """
-    from scipy.stats import poisson
-    from pandas import Series
-
-    output = poisson.pmf(x, mu=mu)
-    output = Series(output)
+    output = Poisson(mu).d(x, out, log)
     return output
 
-def ppois(x, mu=1):
+def ppois(x, mu=1, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a Poisson distribution.
 
@@ -752,6 +2573,13 @@ def ppois(x, mu=1):
         The input values where the CDF is evaluated.
     mu : float, optional
         The expected number of occurrences (mean) of the Poisson distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -764,14 +2592,10 @@ def ppois(x, mu=1):
     2    0.919699
     dtype: float64
     """
-    from scipy.stats import poisson
-    from pandas import Series
-
-    output = poisson.cdf(x, mu=mu)
-    output = Series(output)
+    output = Poisson(mu).p(x, out, lower_tail, log_p)
     return output
 
-def qpois(x, mu=1):
+def qpois(x, mu=1, out=None):
     """
     Computes the quantile function (inverse CDF) of a Poisson distribution.
 
@@ -780,6 +2604,9 @@ def qpois(x, mu=1):
         The quantiles to evaluate.
     mu : float, optional
         The expected number of occurrences (mean) of the Poisson distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     pandas.Series
@@ -792,14 +2619,10 @@ def qpois(x, mu=1):
     2    2.0
     dtype: float64
     """
-    from scipy.stats import poisson
-    from pandas import Series
-
-    output = poisson.ppf(x, mu=mu)
-    output = Series(output)
+    output = Poisson(mu).q(x, out)
     return output
 
-def rpois(n, mu=1):
+def rpois(n, mu=1, out=None, rng=None, workers=None):
     """
     Generates random samples from a Poisson distribution.
 
@@ -808,6 +2631,15 @@ def rpois(n, mu=1):
         The number of random samples to generate.
     mu : float, optional
         The expected number of occurrences (mean) of the Poisson distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional
+        The random number generator to draw from (default is the module-wide one; see `set_seed`).
+    workers : int, optional
+        The number of processes to split the draws across (default is None, for no splitting).
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     pandas.Series
@@ -822,16 +2654,12 @@ def rpois(n, mu=1):
     4    1
     dtype: int64
     """
-    from scipy.stats import poisson
-    from pandas import Series
-
-    output = poisson.rvs(mu=mu, size=n)
-    output = Series(output)
+    output = Poisson(mu).r(n, out, rng, workers)
     return output
 
 ## Binomial Distribution ##########################
 
-def dbinom(x, size=1, prob=0.5):
+def dbinom(x, size=1, prob=0.5, out=None, log=False):
     """
     Computes the probability mass function (PMF) of a Binomial distribution.
 
@@ -842,6 +2670,11 @@ def dbinom(x, size=1, prob=0.5):
         The number of trials (default is 1).
     prob : float, optional
         The probability of success on each trial (default is 0.5).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log probability (default is False).
 
     Returns:
     pandas.Series
@@ -854,14 +2687,10 @@ def dbinom(x, size=1, prob=0.5):
     2    0.250
     dtype: float64
     """
-    from scipy.stats import binom
-    from pandas import Series
-
-    output = binom.pmf(x, n=size, p=prob)
-    output = Series(output)
+    output = Binomial(size, prob).d(x, out, log)
     return output
 
-def pbinom(x, size=1, prob=0.5):
+def pbinom(x, size=1, prob=0.5, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a Binomial distribution.
 
@@ -872,6 +2701,13 @@ def pbinom(x, size=1, prob=0.5):
         The number of trials (default is 1).
     prob : float, optional
         The probability of success on each trial (default is 0.5).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -884,14 +2720,10 @@ def pbinom(x, size=1, prob=0.5):
     2    1.000
     dtype: float64
     """
-    from scipy.stats import binom
-    from pandas import Series
-
-    output = binom.cdf(x, n=size, p=prob)
-    output = Series(output)
+    output = Binomial(size, prob).p(x, out, lower_tail, log_p)
     return output
 
-def qbinom(x, size=1, prob=0.5):
+def qbinom(x, size=1, prob=0.5, out=None):
     """
     Computes the quantile function (inverse CDF) of a Binomial distribution.
 
@@ -902,6 +2734,9 @@ def qbinom(x, size=1, prob=0.5):
         The number of trials (default is 1).
     prob : float, optional
         The probability of success on each trial (default is 0.5).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     pandas.Series
@@ -914,14 +2749,10 @@ def qbinom(x, size=1, prob=0.5):
     2    2.0
     dtype: float64
     """
-    from scipy.stats import binom
-    from pandas import Series
-
-    output = binom.ppf(x, n=size, p=prob)
-    output = Series(output)
+    output = Binomial(size, prob).q(x, out)
     return output
 
-def rbinom(n, size=1, prob=0.5):
+def rbinom(n, size=1, prob=0.5, out=None, rng=None, workers=None):
     """
     Generates random samples from a Binomial distribution.
 
@@ -932,6 +2763,15 @@ def rbinom(n, size=1, prob=0.5):
         The number of trials (default is 1).
     prob : float, optional
         The probability of success on each trial (default is 0.5).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional
+        The random number generator to draw from (default is the module-wide one; see `set_seed`).
+    workers : int, optional
+        The number of processes to split the draws across (default is None, for no splitting).
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     pandas.Series
@@ -946,16 +2786,12 @@ def rbinom(n, size=1, prob=0.5):
     4    1
     dtype: int64
     """
-    from scipy.stats import binom
-    from pandas import Series
-
-    output = binom.rvs(n=size, p=prob, size=n)
-    output = Series(output)
+    output = Binomial(size, prob).r(n, out, rng, workers)
     return output
 
 ## Uniform Distribution ##########################
 
-def dunif(x, min=0, max=1):
+def dunif(x, min=0, max=1, out=None, log=False):
     """
     Computes the probability density function (PDF) of a Uniform distribution.
 
@@ -966,6 +2802,11 @@ def dunif(x, min=0, max=1):
         The lower bound of the Uniform distribution (default is 0).
     max : float, optional
         The upper bound of the Uniform distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    log : bool, optional
+        If True, return the log density (default is False).
 
     Returns:
     pandas.Series
@@ -978,14 +2819,10 @@ def dunif(x, min=0, max=1):
     2    1.0
     dtype: float64
     """
-    from scipy.stats import uniform
-    from pandas import Series
-
-    output = uniform.pdf(x, loc=min, scale=max-min)
-    output = Series(output)
+    output = Uniform(min, max).d(x, out, log)
     return output
 
-def punif(x, min=0, max=1):
+def punif(x, min=0, max=1, out=None, lower_tail=True, log_p=False):
     """
     Computes the cumulative distribution function (CDF) of a Uniform distribution.
 
@@ -996,6 +2833,13 @@ def punif(x, min=0, max=1):
         The lower bound of the Uniform distribution (default is 0).
     max : float, optional
         The upper bound of the Uniform distribution (default is 1).
+    out : numpy.ndarray, optional
+        A preallocated array to write the results into (default is None).
+        If given, the results are written in place and `out` itself is returned.
+    lower_tail : bool, optional
+        If True, return P[X <= x]; if False, the upper tail P[X > x] (default is True).
+    log_p : bool, optional
+        If True, return the log of the probability (default is False).
 
     Returns:
     pandas.Series
@@ -1008,13 +2852,10 @@ def punif(x, min=0, max=1):
     2    0.9
     dtype: float64
     """
-    from scipy.stats import uniform
-    from pandas import Series
-
-    output = uniform.cdf(x, loc=min, scale=max-min)
-    output = Series(output)
+    output = Uniform(min, max).p(x, out, lower_tail, log_p)
     return output
-def qunif(x, min=0, max=1):
+
+def qunif(x, min=0, max=1, out=None):
     """
     Compute the quantile (inverse cumulative distribution function) of the uniform distribution
     for given probabilities.
@@ -1027,6 +2868,9 @@ def qunif(x, min=0, max=1):
         The lower bound of the uniform distribution.
     max : float, optional, default=1
         The upper bound of the uniform distribution.
+    out : numpy.ndarray, optional, default=None
+        A preallocated array to write the results into.
+        If given, the results are written in place and `out` itself is returned.
 
     Returns:
     --------
@@ -1037,14 +2881,10 @@ def qunif(x, min=0, max=1):
     ------
     This function uses `scipy.stats.uniform.ppf` to compute the quantiles.
     """
-    from scipy.stats import uniform
-    from pandas import Series
-    output = uniform.ppf(x, loc=min, scale=max)
-    output = Series(output)
+    output = Uniform(min, max).q(x, out)
     return output
 
-
-def runif(n, min=0, max=1):
+def runif(n, min=0, max=1, out=None, rng=None, workers=None):
     """
     Generate random samples from a uniform distribution.
 
@@ -1056,6 +2896,15 @@ def runif(n, min=0, max=1):
         The lower bound of the uniform distribution.
     max : float, optional, default=1
         The upper bound of the uniform distribution.
+    out : numpy.ndarray, optional, default=None
+        A preallocated array to write the results into.
+        If given, the results are written in place and `out` itself is returned.
+    rng : numpy.random.Generator, optional, default=None
+        The random number generator to draw from. Defaults to the module-wide one (see `set_seed`).
+    workers : int, optional, default=None
+        The number of processes to split the draws across. Leave as None for no splitting.
+        The draws are the same with or without workers, and for any number of them, given the same `rng`.
+        Workers send their draws back a few at a time, so memory use stays close to the n draws themselves.
 
     Returns:
     --------
@@ -1064,10 +2913,262 @@ def runif(n, min=0, max=1):
     
     Notes:
     ------
-    This function uses `scipy.stats.uniform.rvs` to generate the random samples.
+    This function uses `numpy.random.Generator.uniform` to generate the random samples.
     """
-    from scipy.stats import uniform
-    from pandas import Series
-    output = uniform.rvs(loc=min, scale=max, size=n)
-    output = Series(output)
+    output = Uniform(min, max).r(n, out, rng, workers)
     return output
+
+
+# Parameter Sweeps ##############################
+
+# Arguments of the d/p/q/r functions that aren't distribution parameters
+_NOT_PARAMS = ('x', 'n', 'out', 'rng', 'workers', 'log', 'lower_tail', 'log_p')
+
+def _lookup(fun, kinds):
+    """
+    Resolve a d/p/q/r function (or its name) into its name, prefix, and family,
+    checking that its prefix is one of `kinds`.
+    """
+    name = getattr(fun, '__name__', fun)
+    kind, family = name[:1], name[1:]
+    if kind not in kinds or family not in _FAMILIES:
+        raise ValueError("`fun` must be one of the " + "/".join(kinds) + " distribution functions, like " + kinds[0] + "norm.")
+    return name, kind, family
+
+def _parameters(name, params):
+    """
+    Line up keyword `params` for function `name` in its positional order,
+    filling in the function's defaults for any left out.
+    """
+    defaults = {key: value.default for key, value in signature(globals()[name]).parameters.items() if key not in _NOT_PARAMS}
+    for key in params:
+        if key not in defaults:
+            raise ValueError("`" + key + "` is not a parameter of " + name + "().")
+    return [params.get(key, default) for key, default in defaults.items()]
+
+def sweep(fun, x, chunk_cells=2**22, out=None, **params):
+    """
+    Evaluate a d/p/q function over many parameter sets at once,
+    returning a 2-D grid with one row per parameter set and one column per value of x.
+
+    Parameters:
+    -----------
+    fun : function or str
+        The d/p/q function to evaluate, e.g. `dnorm` or "dnorm".
+    x : array-like
+        The values (or probabilities, for q functions) to evaluate each parameter set at.
+    chunk_cells : int, optional, default=2**22
+        The most cells (rows x columns) to compute in one vectorized pass.
+        Larger sweeps are computed a block of rows at a time, to bound memory.
+    out : numpy.ndarray, optional, default=None
+        A preallocated (parameter sets x len(x)) array to write the results into.
+    **params : array-like
+        The parameters of `fun`, by name (e.g. mean=, sd=). Each is a scalar or a 1-D array;
+        arrays are paired up element by element (not crossed), so they must share one length.
+        Parameters you leave out take `fun`'s defaults.
+
+    Returns:
+    --------
+    numpy.ndarray
+        A 2-D array where row i holds `fun(x, <parameter set i>)`.
+
+    Raises:
+    -------
+    ValueError:
+        - If `fun` is not one of the d/p/q distribution functions.
+        - If a parameter is not one of `fun`'s parameters.
+
+    Notes:
+    ------
+    To sweep every combination of two parameters, cross them first with `numpy.meshgrid`
+    and pass the flattened results.
+
+    Examples:
+    ---------
+    sweep(dnorm, x=[0, 1, 2], mean=[0, 1, 2, 3], sd=1)
+    m, s = np.meshgrid(seq(0, 5, length_out=100), seq(0.5, 3, length_out=100))
+    sweep("dnorm", x=[4.5, 5, 5.5], mean=m.ravel(), sd=s.ravel())
+    """
+    name, kind, family = _lookup(fun, ('d', 'p', 'q'))
+    values = [np.ravel(np.asarray(value, dtype=float)) for value in _parameters(name, params)]
+    values = np.broadcast_arrays(*values)
+    x = np.ravel(np.asarray(x, dtype=float))
+
+    if out is None:
+        out = np.empty((len(values[0]), len(x)))
+    rows = max(1, chunk_cells // max(len(x), 1))
+    for start in range(0, len(values[0]), rows):
+        block = slice(start, start + rows)
+        chunk = out[block]
+        result = _evaluate(name, x[None, :], tuple(value[block, None] for value in values), chunk)
+        if result is not chunk:
+            chunk[...] = result
+    return out
+
+
+# Streaming Simulation ##############################
+
+# Simulations too big for memory can be drawn a chunk at a time with stream(),
+# and summarized on the fly by feeding each chunk to reducers with consume().
+
+def stream(fun, n, chunk_size=2**20, rng=None, **params):
+    """
+    Draw `n` random values a chunk at a time, without ever holding all of them in memory.
+
+    Parameters:
+    -----------
+    fun : function or str
+        The r function to draw from, e.g. `rnorm` or "rnorm".
+    n : int
+        The total number of random values to draw.
+    chunk_size : int, optional, default=2**20
+        The number of values in each chunk (the last chunk may be shorter).
+    rng : numpy.random.Generator, optional, default=None
+        The random number generator to draw from. Defaults to the module-wide one (see `set_seed`).
+    **params : float
+        The parameters of `fun`, by name (e.g. mean=, sd=). Parameters you leave out take `fun`'s defaults.
+
+    Returns:
+    --------
+    iterator of numpy.ndarray
+        The draws, `chunk_size` at a time.
+
+    Examples:
+    ---------
+    m = Moments()
+    h = Histogram(-4, 4, bins=50)
+    consume(stream(rnorm, n=10**9, mean=0, sd=1), m, h)
+    m.mean, m.sd
+    """
+    name, kind, family = _lookup(fun, ('r',))
+    values = _parameters(name, params)
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be at least 1.")
+    rng = _options['rng'] if rng is None else rng
+    return (_SAMPLERS[family](rng, min(chunk_size, n - start), *values) for start in range(0, n, chunk_size))
+
+def consume(chunks, *reducers):
+    """
+    Feed every chunk from `chunks` to each of the `reducers`, in a single pass.
+
+    Parameters:
+    -----------
+    chunks : iterable of array-like
+        The data, a chunk at a time (e.g. from `stream`).
+    *reducers : Moments, Histogram, or QuantileSketch
+        Anything with an `update(chunk)` method.
+
+    Returns:
+    --------
+    tuple
+        The reducers, now holding statistics for all the chunks.
+    """
+    for chunk in chunks:
+        for reducer in reducers:
+            reducer.update(chunk)
+    return reducers
+
+class Histogram:
+    """
+    Running histogram of a stream of values, over fixed, equal-width bins.
+
+    Parameters:
+    -----------
+    lower : float
+        The left edge of the first bin.
+    upper : float
+        The right edge of the last bin.
+    bins : int, optional, default=30
+        The number of bins.
+
+    Attributes:
+    -----------
+    edges : numpy.ndarray
+        The bin edges.
+    counts : numpy.ndarray
+        How many values have landed in each bin. Values equal to `upper` go in the last bin.
+    below, above : int
+        How many values fell below `lower` or above `upper` (these aren't in any bin).
+    """
+
+    def __init__(self, lower, upper, bins=30):
+        if not upper > lower:
+            raise ValueError("`upper` must be greater than `lower`.")
+        if bins < 1:
+            raise ValueError("`bins` must be at least 1.")
+        self.edges = np.linspace(lower, upper, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+
+    def update(self, chunk):
+        """
+        Add a chunk of values to the counts.
+        """
+        chunk = np.ravel(np.asarray(chunk, dtype=float))
+        lower, upper = self.edges[0], self.edges[-1]
+        bins = len(self.counts)
+        self.below += int(np.count_nonzero(chunk < lower))
+        self.above += int(np.count_nonzero(chunk > upper))
+        chunk = chunk[(chunk >= lower) & (chunk <= upper)]
+        index = ((chunk - lower) * (bins / (upper - lower))).astype(np.int64)
+        np.minimum(index, bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=bins)
+        return self
+
+    def tidy(self):
+        """
+        Return the histogram as a DataFrame with one row per bin:
+        its midpoint 'x', edges 'lower' and 'upper', and 'count'.
+        """
+        return pd.DataFrame({'x': (self.edges[:-1] + self.edges[1:]) / 2,
+                             'lower': self.edges[:-1], 'upper': self.edges[1:], 'count': self.counts})
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of values, using a fixed amount of memory.
+
+    The sketch keeps a uniform random sample of `size` values from the stream
+    (every value gets a random key, and the values with the `size` smallest keys are kept).
+    Quantiles of the sample estimate quantiles of the stream to within a rank error of
+    about sqrt(q * (1 - q) / size): for size=10**5, about ±0.0016 at the median.
+
+    Parameters:
+    -----------
+    size : int, optional, default=10**5
+        How many values to keep.
+    rng : numpy.random.Generator, optional, default=None
+        The random number generator for the keys. Defaults to the module-wide one (see `set_seed`).
+    """
+
+    def __init__(self, size=10**5, rng=None):
+        self.size = size
+        self.count = 0
+        self.rng = _options['rng'] if rng is None else rng
+        self._values = np.empty(0)
+        self._keys = np.empty(0)
+
+    def update(self, chunk):
+        """
+        Offer a chunk of values to the sample.
+        """
+        chunk = np.ravel(np.asarray(chunk, dtype=float))
+        self.count += chunk.size
+        keys = self.rng.random(chunk.size)
+        # Once the sample is full, only values with keys below its largest key can get in
+        if len(self._keys) == self.size:
+            keep = keys < self._keys.max()
+            chunk, keys = chunk[keep], keys[keep]
+        values = np.concatenate([self._values, chunk])
+        keys = np.concatenate([self._keys, keys])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size - 1)[:self.size]
+            values, keys = values[keep], keys[keep]
+        self._values, self._keys = values, keys
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate the quantiles `q` (probabilities between 0 and 1) of everything seen so far.
+        """
+        return np.quantile(self._values, q)
@@ -0,0 +1,100 @@
+# test_distributions.py
+# Checks that the fast d/p/q kernels in distributions.py match scipy.stats to within 1e-12.
+# Run with:
+#   python -m pytest O/test_distributions.py
+import numpy as np
+import pytest
+from scipy import stats
+import distributions as dist
+
+# scipy warns about overflow at the +-inf and 1e300 edge cases; we only compare its answers
+pytestmark = pytest.mark.filterwarnings("ignore::RuntimeWarning")
+
+# Each family pairs its R-style parameter sets with a function making the matching frozen scipy distribution
+FAMILIES = {
+    'norm': ([dict(mean=0, sd=1), dict(mean=-3.5, sd=0.2), dict(mean=1e3, sd=50)],
+             lambda mean, sd: stats.norm(mean, sd)),
+    'exp': ([dict(rate=1), dict(rate=0.01), dict(rate=25)],
+            lambda rate: stats.expon(scale=1 / rate)),
+    'weibull': ([dict(shape=2, scale=1), dict(shape=0.5, scale=3), dict(shape=7.5, scale=0.1)],
+                lambda shape, scale: stats.weibull_min(shape, scale=scale)),
+    'unif': ([dict(min=0, max=1), dict(min=-2, max=5), dict(min=10, max=10.5)],
+             lambda min, max: stats.uniform(min, max - min)),
+}
+
+# Values at and around the edges of every support
+EDGES_X = np.array([0, -0.0, -1, -1e-300, 1e-300, 0.5, 1, 10, 1e300, -np.inf, np.inf, np.nan])
+EDGES_P = np.array([0, 1, -0.1, 1.1, -np.inf, np.inf, np.nan, 1e-300, 1e-16, 0.5, 1 - 1e-16, 1 - 1e-10])
+
+CASES = [(family, params, make) for family, (sets, make) in FAMILIES.items() for params in sets]
+IDS = [f"{family}-{'-'.join(str(v) for v in params.values())}" for family, params, _ in CASES]
+
+@pytest.fixture(autouse=True)
+def fast_backend():
+    backend = dist.set_backend('fast')
+    return_type = dist.set_return_type('ndarray')
+    yield
+    dist.set_backend(backend)
+    dist.set_return_type(return_type)
+
+def _inputs(frozen):
+    """
+    Random draws from the distribution, spread a little past its support, plus the edge cases.
+    """
+    rng = np.random.default_rng(20240101)
+    draws = frozen.rvs(size=2000, random_state=rng)
+    lower, upper = frozen.ppf([0.001, 0.999])
+    spread = rng.uniform(lower - (upper - lower), upper + (upper - lower), size=1000)
+    return np.concatenate([draws, spread, EDGES_X])
+
+def _probabilities():
+    rng = np.random.default_rng(20240102)
+    return np.concatenate([rng.uniform(size=2000), np.exp(-rng.uniform(0, 700, size=500)), EDGES_P])
+
+def _check(actual, expected):
+    np.testing.assert_allclose(np.asarray(actual), expected, rtol=1e-12, atol=0, equal_nan=True)
+
+@pytest.mark.parametrize('family, params, make', CASES, ids=IDS)
+def test_density(family, params, make):
+    frozen, x = make(**params), _inputs(make(**params))
+    _check(getattr(dist, 'd' + family)(x, **params), frozen.pdf(x))
+    _check(getattr(dist, 'd' + family)(x, **params, log=True), frozen.logpdf(x))
+
+@pytest.mark.parametrize('family, params, make', CASES, ids=IDS)
+def test_probability(family, params, make):
+    frozen, x = make(**params), _inputs(make(**params))
+    p = getattr(dist, 'p' + family)
+    _check(p(x, **params), frozen.cdf(x))
+    _check(p(x, **params, lower_tail=False), frozen.sf(x))
+    _check(p(x, **params, log_p=True), frozen.logcdf(x))
+    _check(p(x, **params, lower_tail=False, log_p=True), frozen.logsf(x))
+
+@pytest.mark.parametrize('family, params, make', CASES, ids=IDS)
+def test_quantile(family, params, make):
+    frozen, p = make(**params), _probabilities()
+    _check(getattr(dist, 'q' + family)(p, **params), frozen.ppf(p))
+
+@pytest.mark.parametrize('family, params, make', CASES, ids=IDS)
+def test_kernels_used(family, params, make):
+    # The fast kernels (not scipy) should be what the checks above exercised
+    covered = dist._covered(family, tuple(params.values()))
+    for kind in ('d', 'p', 'q', 's', 'logp', 'logs'):
+        assert dist._kernel(kind, family, covered) is not None
+
+def test_gamma_upper_tail():
+    x = _inputs(stats.gamma(2.5, scale=1 / 3))
+    _check(dist.pgamma(x, shape=2.5, rate=3, lower_tail=False), stats.gamma.sf(x, 2.5, scale=1 / 3))
+
+@pytest.mark.parametrize('shape', [1e-3, 0.05, 2.5])
+def test_gamma_table_at_finest_tolerance(shape):
+    # At the smallest tolerance set_quantiles allows, building the table must finish
+    # (or give up, and leave lookups to scipy), and its quantiles must stay within that tolerance
+    previous = dist.set_quantiles('table', 1e-12)
+    try:
+        dist.clear_cache()
+        p = np.concatenate([_probabilities(), [0.05]])
+        expected = stats.gamma.ppf(p, shape)
+        np.testing.assert_allclose(dist.qgamma(p, shape=shape), expected, rtol=1e-12, atol=0, equal_nan=True)
+    finally:
+        dist.set_quantiles(previous)
+        dist.clear_cache()
@@ -138,13 +138,19 @@ np.sum(np.log(stats.expon.pdf(sw, scale=1/0.1)))
 
 # They're equivalent
 
+# Even better, ask for the log-probabilities directly with logpdf().
+# It skips the extra pass through np.log(), and won't underflow to -inf
+# for extreme values whose probabilities round to 0.
+# (In our distributions.py, dexp(sw, rate=0.1, log=True) does the same.)
+np.sum(stats.expon.logpdf(sw, scale=1/0.1))
+
 # Then, we write up a short function called loglikelihood(), including two 
 # inputs (1) par and (2) our data x. I added an example value 0.1 to par just 
 # as a reminder for what it means.
 
 def loglikelihood(par, x):
     # par is the rate parameter, scale = 1/par
-    return np.sum(np.log(stats.expon.pdf(x, scale=1/par)))
+    return np.sum(stats.expon.logpdf(x, scale=1/par))
 
 # Try it!
 loglikelihood(0.1, sw)
@@ -165,6 +171,12 @@ result = minimize_scalar(lambda par: -loglikelihood(par, sw),
                          method='bounded')
 print(result)
 
+# Tip: our distributions.py (in module O) has loglik(), which also returns the
+# gradient, computed from a few summary statistics (n and sum(x) for the exponential).
+# Gradient-based optimizers use it to get there in just a few cheap steps:
+#   s = sufficient("exp", sw)
+#   minimize(lambda par: [-v for v in loglik("exp", par, s)], x0=[0.1], jac=True, bounds=[(0.001, 10)])
+
 # Compare the final parameter value against scipy.stats.expon.fit()'s results! 
 # They're about the same.
 
@@ -271,6 +283,11 @@ print("\nWeibull distribution:")
 weibull_params = stats.weibull_min.fit(corgi, floc=0)
 print(f"Shape: {weibull_params[0]}, Scale: {weibull_params[2]}")
 
+# Tip: our distributions.py (in module O) has fitdistr(), which fits all of these
+# at once, and can fit thousands of groups (e.g. one per bus route) in one go:
+#   fitdistr(corgi)
+#   fitdistr(delays.minutes, group=delays.route)
+
 
 # 5. Conclusion #######################################
 